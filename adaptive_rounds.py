@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass
+from typing import Optional
+import argparse
+import numpy as np
+import pandas as pd
+from assignment_export import AssignmentExporter
+from assignment_matrix import AssignmentMatrix
+from calculate_scores import aggregate_points, bootstrap_rankings
+from judge_constraints import CONFLICT, JudgeConstraints
+from judging_assignments import AssignmentGenerator, AssignmentVerifier, JudgingSystem
+from roster_loader import load_judges, load_teams
+from roster_store import JudgeStore, ProjectStore
+from schedule_repair import ScheduleRepairer
+
+IN = 'in'
+OUT = 'out'
+UNCERTAIN = 'uncertain'
+
+def classify_teams(points: pd.DataFrame, teams: pd.DataFrame, top_k: int = 10, resamples: int = 2000,
+                   band: tuple = (0.05, 0.95), seed: int = None) -> pd.DataFrame:
+    """
+    Ranks teams from the scores so far and bootstraps each team's chance of
+    finishing in the top K. Teams at or above band[1] are in, at or below
+    band[0] are out, and the rest are uncertain and worth another judging.
+    Teams nobody has scored yet are uncertain.
+    """
+    # aggregate_points adds each row's per-judge standardized score, which the bootstrap resamples
+    points = points.copy()
+    ranking = aggregate_points(points, teams)
+    intervals = bootstrap_rankings(points, resamples, top_k, seed=seed)
+    table = teams[['tableNumber', 'teamName']].merge(ranking[['tableNumber', 'standardizedPoints', 'judgeCount']],
+                                                     on='tableNumber', how='left')
+    table = table.merge(intervals, on='tableNumber', how='left')
+    probability = table['topKProbability']
+    table['status'] = np.where(probability >= band[1], IN, np.where(probability <= band[0], OUT, UNCERTAIN))
+    table.loc[probability.isna(), 'status'] = UNCERTAIN
+    return table.sort_values('standardizedPoints', ascending=False, na_position='last').reset_index(drop=True)
+
+@dataclass
+class NextRound:
+    system: JudgingSystem
+    matrix: AssignmentMatrix
+    valid: bool
+    attempts: int
+
+def plan_next_round(judges: JudgeStore, teams: ProjectStore, points: pd.DataFrame, tables: np.ndarray, num_rooms: int,
+                    judgings_per_project: int, seed: int = 0, max_attempts: int = 10) -> Optional[NextRound]:
+    """
+    Schedules one more round for the given tables only. Every judge who has
+    already scored a team is given a conflict with it, so each extra judging
+    comes from a fresh pair of eyes. With most judges blocked for a team the
+    greedy pass can leave it short, so missing judgings are topped up the way
+    a repair places orphans before the usual verifier checks the result.
+    """
+    selected = np.flatnonzero(np.isin(teams.table_numbers, tables))
+    if len(selected) == 0:
+        return None
+    projects = ProjectStore([teams.names[i] for i in selected.tolist()], teams.table_numbers[selected])
+    system = JudgingSystem.from_stores(judges, projects, min(num_rooms, len(projects)), judgings_per_project)
+
+    seen = points[['judgeNumber', 'tableNumber']].drop_duplicates()
+    seen = seen[seen['judgeNumber'].isin(judges.judge_ids) & seen['tableNumber'].isin(projects.table_numbers)]
+    system.constraints = JudgeConstraints.from_dataframe(seen.rename(columns={'judgeNumber': 'judgeId'}).assign(constraint=CONFLICT),
+                                                         judges.judge_ids, projects.table_numbers, 'points')
+
+    for attempt in range(1, max_attempts + 1):
+        matrix = AssignmentGenerator(system, seed=seed + attempt - 1).generate_matrix()
+        matrix = ScheduleRepairer(system, matrix).fill_missing().matrix
+        valid = AssignmentVerifier(None, system, matrix).is_valid()
+        if valid:
+            break
+    return NextRound(system, matrix, valid, attempt)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule the next judging round for teams whose top-K placement is still uncertain.")
+    parser.add_argument('--points', default='points.csv', help="scores so far (judgeNumber, tableNumber, points)")
+    parser.add_argument('--teams-csv', default='team.csv', help="team roster (teamName, tableNumber)")
+    parser.add_argument('--judges-csv', default='judges.csv', help="judge roster; judge i is judgeNumber 1000 + i")
+    parser.add_argument('--rooms', type=int, required=True)
+    parser.add_argument('--judgings-per-project', type=int, default=1, help="extra judgings per uncertain team this round")
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--resamples', type=int, default=2000)
+    parser.add_argument('--band', type=float, nargs=2, default=[0.05, 0.95], metavar=('LOW', 'HIGH'),
+                        help="top-K probabilities treated as settled out / in")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='next_round.csv')
+    parser.add_argument('--status', help="CSV to write each team's top-K probability and status to")
+    args = parser.parse_args(argv)
+
+    judge_roster = load_judges(args.judges_csv)
+    team_roster = load_teams(args.teams_csv)
+    judges = JudgeStore(judge_roster.first_names.tolist(), judge_roster.last_names.tolist())
+    teams = ProjectStore(team_roster.names.tolist(), team_roster.table_numbers)
+    points = pd.read_csv(args.points, usecols=['judgeNumber', 'tableNumber', 'points'])
+
+    status = classify_teams(points, pd.DataFrame({'tableNumber': teams.table_numbers, 'teamName': teams.names}),
+                            args.top_k, args.resamples, tuple(args.band), args.seed)
+    if args.status:
+        status.to_csv(args.status, index=False)
+    counts = status['status'].value_counts()
+    print(f"{counts.get(IN, 0)} teams in, {counts.get(OUT, 0)} out, {counts.get(UNCERTAIN, 0)} uncertain for the top {args.top_k}")
+
+    uncertain = status.loc[status['status'] == UNCERTAIN, 'tableNumber'].to_numpy()
+    next_round = plan_next_round(judges, teams, points, uncertain, args.rooms, args.judgings_per_project, args.seed)
+    if next_round is None:
+        print("The top-K selection is settled; no further round is needed.")
+        return True
+    full_round = len(teams) * args.judgings_per_project
+    print(f"Scheduling {len(uncertain) * args.judgings_per_project} judgings instead of {full_round} for a full round")
+    if not next_round.valid:
+        print(f"No valid round could be generated in {next_round.attempts} attempts")
+        return False
+    AssignmentExporter(next_round.system, next_round.matrix).write(args.output)
+    print(f"Saved next-round assignments to '{args.output}'")
+    return True
+
+if __name__ == "__main__":
+    main()
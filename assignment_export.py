@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+import csv
+import os
+import struct
+import numpy as np
+from assignment_matrix import AssignmentMatrix, EMPTY
+
+NO_TEAM = 'No team for this time slot'
+
+# Binary layout: header, then num_judges x num_slots little-endian int32 project ids (-1 = empty)
+BINARY_MAGIC = b'JDGA'
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct('<4sHIII')
+
+class AssignmentExporter:
+    """
+    Writes a schedule straight from its AssignmentMatrix, one row at a time,
+    using display labels computed once per project. No DataFrame is built.
+    """
+
+    def __init__(self, system, matrix: AssignmentMatrix):
+        self.system = system
+        self.matrix = matrix
+        # Label per project id - 1, with the empty-cell label last so EMPTY (-1) indexes it directly
+        self.labels = system.projects.labels()
+        self.labels.append(NO_TEAM)
+        self.judge_names = system.judges.full_names()
+
+    def _judge_id(self, judge: int) -> int:
+        return 1001 + judge
+
+    def _row_labels(self, judge: int) -> List[str]:
+        labels = self.labels
+        return [labels[project - 1] if project != EMPTY else labels[-1] for project in self.matrix.data[judge].tolist()]
+
+    def write_csv(self, path: str):
+        # Same layout as AssignmentGenerator's DataFrame written with to_csv
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(['Judge', 'Judge ID'] + [f'Slot {i+1}' for i in range(self.matrix.num_slots)])
+            for judge in range(self.matrix.num_judges):
+                writer.writerow([self.judge_names[judge], self._judge_id(judge)] + self._row_labels(judge))
+
+    def write_long(self, path: str):
+        # One row per filled cell: judge, slot, table
+        projects = self.system.projects
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(['Judge ID', 'Judge', 'Slot', 'Table Number', 'Team Name'])
+            for judge in range(self.matrix.num_judges):
+                for slot, project in enumerate(self.matrix.data[judge].tolist()):
+                    if project != EMPTY:
+                        team = projects[project - 1]
+                        writer.writerow([self._judge_id(judge), self.judge_names[judge], slot + 1, team.table_number, team.name])
+
+    def write_binary(self, path: str):
+        write_binary(path, self.matrix)
+
+    def write_judge_file(self, judge: int, directory: str, num_slots: int = None) -> str:
+        # Slots past num_slots, e.g. the empty padding a repair adds for unchanged judges, are left out
+        path = os.path.join(directory, f'judge_{self._judge_id(judge)}.csv')
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator=os.linesep)
+            writer.writerow(['Judge', self.judge_names[judge]])
+            writer.writerow(['Slot', 'Assignment'])
+            for slot, label in enumerate(self._row_labels(judge)[:num_slots]):
+                writer.writerow([f'Slot {slot + 1}', label])
+        return path
+
+    def write_judge_files(self, directory: str, judges: List[int] = None, max_workers: int = None,
+                          num_slots: int = None) -> List[str]:
+        """
+        Writes one sheet per judge (all judges by default) to directory using
+        a thread pool, and returns the paths in judge order. With num_slots,
+        only the first num_slots slots are written.
+        """
+        os.makedirs(directory, exist_ok=True)
+        judges = range(self.matrix.num_judges) if judges is None else judges
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(lambda judge: self.write_judge_file(judge, directory, num_slots), judges))
+
+    def write(self, path: str, fmt: str = 'csv'):
+        writers = {'csv': self.write_csv, 'long': self.write_long, 'binary': self.write_binary}
+        if fmt not in writers:
+            raise ValueError(f"Unknown export format '{fmt}' (expected one of {', '.join(writers)})")
+        writers[fmt](path)
+
+def write_binary(path: str, matrix: AssignmentMatrix):
+    with open(path, 'wb') as f:
+        f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, matrix.num_judges, matrix.num_slots, matrix.num_projects))
+        f.write(matrix.data.astype('<i4', copy=False).tobytes())
+
+def read_binary(path: str) -> AssignmentMatrix:
+    with open(path, 'rb') as f:
+        magic, version, num_judges, num_slots, num_projects = BINARY_HEADER.unpack(f.read(BINARY_HEADER.size))
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError(f"'{path}' is not a version {BINARY_VERSION} assignment file")
+        data = np.frombuffer(f.read(), dtype='<i4', count=num_judges * num_slots)
+    return AssignmentMatrix(data.reshape(num_judges, num_slots), num_projects)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+from typing import List, Tuple
+import numpy as np
+
+EMPTY = -1
+
+class AssignmentMatrix:
+    """
+    Dense judges x slots schedule of project ids (1-based table indices).
+    Empty cells hold EMPTY (-1). Project counts are indexed by project id - 1.
+    """
+
+    def __init__(self, data: np.ndarray, num_projects: int):
+        self.data = np.ascontiguousarray(data, dtype=np.int32)
+        if self.data.ndim != 2:
+            raise ValueError("AssignmentMatrix data must be two-dimensional")
+        self.num_projects = num_projects
+
+    @classmethod
+    def empty(cls, num_judges: int, num_slots: int, num_projects: int) -> 'AssignmentMatrix':
+        return cls(np.full((num_judges, num_slots), EMPTY, dtype=np.int32), num_projects)
+
+    @property
+    def num_judges(self) -> int:
+        return self.data.shape[0]
+
+    @property
+    def num_slots(self) -> int:
+        return self.data.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, AssignmentMatrix):
+            return NotImplemented
+        return self.num_projects == other.num_projects and np.array_equal(self.data, other.data)
+
+    def copy(self) -> 'AssignmentMatrix':
+        return AssignmentMatrix(self.data.copy(), self.num_projects)
+
+    def trimmed(self, num_slots: int) -> 'AssignmentMatrix':
+        return AssignmentMatrix(self.data[:, :num_slots], self.num_projects)
+
+    def filled_mask(self) -> np.ndarray:
+        return self.data != EMPTY
+
+    def project_counts(self) -> np.ndarray:
+        # Number of judgings per project, index i holds project i + 1
+        filled = self.data[self.filled_mask()]
+        return np.bincount(filled - 1, minlength=self.num_projects)[:self.num_projects]
+
+    def judge_loads(self) -> np.ndarray:
+        return np.count_nonzero(self.filled_mask(), axis=1)
+
+    def idle_cells(self) -> int:
+        return int(self.data.size - np.count_nonzero(self.filled_mask()))
+
+    def repeated_cells(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns (slots, judges) of every cell holding a project that an earlier
+        judge already has in the same slot, in slot order. Detection sorts each
+        slot column once; the sort is stable, so the first judge is not listed.
+        """
+        if self.data.size == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        order = np.argsort(self.data, axis=0, kind='stable')
+        columns = np.take_along_axis(self.data, order, axis=0)
+        repeated = (columns[1:] == columns[:-1]) & (columns[1:] != EMPTY)
+        slots, positions = np.nonzero(repeated.T)
+        return slots, order[positions + 1, slots]
+
+    def slot_duplicates(self) -> List[Tuple[int, np.ndarray]]:
+        """
+        Returns (slot, duplicated project ids) for every slot in which a project
+        appears more than once.
+        """
+        slots, judges = self.repeated_cells()
+        projects = self.data[judges, slots]
+        return [(int(slot), np.unique(projects[slots == slot])) for slot in np.unique(slots).tolist()]
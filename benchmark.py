@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Tuple
+import argparse
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from assignment_export import AssignmentExporter
+from judging_assignments import (JudgingSystem, AssignmentGenerator, ExactAssignmentGenerator, AssignmentVerifier,
+                                 OverlapAwareAssignmentGenerator)
+
+STAGES = ['system', 'generate', 'verify', 'export']
+
+# judges x projects x rooms x judgings_per_project
+GRIDS = {
+    'quick': ([10, 50], [60, 300], [3, 6], [3]),
+    'full': ([10, 50, 300], [60, 300, 1200], [3, 10, 20], [2, 3, 5]),
+}
+
+# Modules the scheduling core loads; importing them must not pull in any of STARTUP_EXCLUDED
+CORE_MODULES = ['judging_assignments', 'assignment_export', 'schedule_repair']
+STARTUP_EXCLUDED = ['pandas']
+STARTUP_BUDGET_SECONDS = 0.3
+
+ENGINES = {
+    'greedy': AssignmentGenerator,
+    'exact': ExactAssignmentGenerator,
+    'overlap': OverlapAwareAssignmentGenerator,
+}
+# Shapes an engine once failed to verify on every attempt: judges, projects, rooms, judgings_per_project, engine
+KNOWN_FAILURES = [
+    (60, 300, 1, 3, 'overlap'),
+]
+
+@dataclass
+class StageResult:
+    seconds: float
+    peak_bytes: int
+
+@dataclass
+class CaseResult:
+    judges: int
+    projects: int
+    rooms: int
+    judgings_per_project: int
+    retries: int
+    verified: bool
+    stages: Dict[str, StageResult]
+
+    @property
+    def key(self) -> str:
+        return f'{self.judges}x{self.projects}x{self.rooms}x{self.judgings_per_project}'
+
+def _measure(func: Callable, repeat: int):
+    # Best-of-repeat wall time untraced, then one traced run for the allocation peak
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, StageResult(best, peak)
+
+def measure_startup(modules: List[str] = CORE_MODULES, repeat: int = 5) -> Tuple[float, List[str]]:
+    """
+    Imports modules in fresh interpreters and returns the fastest import
+    time, excluding interpreter start-up, with any STARTUP_EXCLUDED modules
+    that the imports loaded.
+    """
+    code = (f"import sys, time; start = time.perf_counter(); import {', '.join(modules)}; "
+            f"print(time.perf_counter() - start); "
+            f"print(','.join(name for name in {STARTUP_EXCLUDED!r} if name in sys.modules))")
+    best = float('inf')
+    loaded: List[str] = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True).stdout.splitlines()
+        best = min(best, float(output[0]))
+        loaded = [name for name in output[1].split(',') if name] if len(output) > 1 else []
+    return best, loaded
+
+def run_case(judges: int, projects: int, rooms: int, judgings_per_project: int, seed: int = 0,
+             repeat: int = 3, max_attempts: int = 10, exact: bool = False) -> CaseResult:
+    def build_system():
+        random.seed(seed)
+        return JudgingSystem(num_rooms=rooms, judgings_per_project=judgings_per_project, demo_mode=True,
+                             num_judges=judges, total_projects=projects)
+
+    system, system_stage = _measure(build_system, repeat)
+
+    def generate() -> Tuple[AssignmentGenerator, object, int, bool]:
+        generator_class = ExactAssignmentGenerator if exact else AssignmentGenerator
+        for attempt in range(max_attempts):
+            generator = generator_class(system, seed=seed + attempt)
+            df = generator.generate_assignments()
+            if AssignmentVerifier(df, system, generator.assignments).is_valid():
+                return generator, df, attempt, True
+        return generator, df, max_attempts - 1, False
+
+    (generator, df, retries, verified), generate_stage = _measure(generate, repeat)
+    _, verify_stage = _measure(lambda: AssignmentVerifier(df, system, generator.assignments).verify_all(), repeat)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'assignments.csv')
+        _, export_stage = _measure(lambda: AssignmentExporter(system, generator.assignments).write_csv(path), repeat)
+
+    return CaseResult(judges, projects, rooms, judgings_per_project, retries, verified, {
+        'system': system_stage,
+        'generate': generate_stage,
+        'verify': verify_stage,
+        'export': export_stage,
+    })
+
+def check_known_failures(seed: int = 0, max_attempts: int = 10) -> List[str]:
+    # One message per KNOWN_FAILURES shape that still has no verified attempt
+    failures = []
+    for judges, projects, rooms, judgings_per_project, engine in KNOWN_FAILURES:
+        random.seed(seed)
+        system = JudgingSystem(num_rooms=rooms, judgings_per_project=judgings_per_project, demo_mode=True,
+                               num_judges=judges, total_projects=projects)
+        if not any(AssignmentVerifier(None, system, ENGINES[engine](system, seed=seed + attempt).generate_matrix()).is_valid()
+                   for attempt in range(max_attempts)):
+            failures.append(f'{judges}x{projects}x{rooms}x{judgings_per_project} {engine}: no attempt verifies')
+    return failures
+
+def run_grid(grid: str, **kwargs) -> List[CaseResult]:
+    results = []
+    for judges, projects, rooms, judgings_per_project in itertools.product(*GRIDS[grid]):
+        if judgings_per_project > judges:
+            continue
+        results.append(run_case(judges, projects, rooms, judgings_per_project, **kwargs))
+    return results
+
+def save_baseline(results: List[CaseResult], path: str):
+    with open(path, 'w') as f:
+        json.dump({result.key: asdict(result) for result in results}, f, indent=2)
+
+def compare_to_baseline(results: List[CaseResult], path: str, time_tolerance: float = 1.5,
+                        memory_tolerance: float = 1.25, min_seconds: float = 0.005) -> List[str]:
+    """
+    Returns one message per regression: a stage slower than time_tolerance x
+    baseline (ignoring differences under min_seconds), a stage allocating more
+    than memory_tolerance x its baseline peak, more retries, or a case that no
+    longer verifies.
+    """
+    with open(path) as f:
+        baseline = json.load(f)
+
+    regressions = []
+    for result in results:
+        base = baseline.get(result.key)
+        if base is None:
+            continue
+        if result.retries > base['retries']:
+            regressions.append(f"{result.key}: retries {base['retries']} -> {result.retries}")
+        if base['verified'] and not result.verified:
+            regressions.append(f"{result.key}: no longer verifies")
+        for stage in STAGES:
+            old, new = base['stages'][stage], result.stages[stage]
+            if new.seconds > old['seconds'] * time_tolerance and new.seconds - old['seconds'] > min_seconds:
+                regressions.append(f"{result.key} {stage}: {old['seconds']:.4f}s -> {new.seconds:.4f}s")
+            if new.peak_bytes > old['peak_bytes'] * memory_tolerance:
+                regressions.append(f"{result.key} {stage}: peak {old['peak_bytes']} -> {new.peak_bytes} bytes")
+    return regressions
+
+def print_results(results: List[CaseResult]):
+    header = f"{'case':<18}{'retries':>8}{'ok':>4}" + ''.join(f'{stage + " s":>12}{stage + " KiB":>14}' for stage in STAGES)
+    print(header)
+    for result in results:
+        row = f'{result.key:<18}{result.retries:>8}{"y" if result.verified else "n":>4}'
+        for stage in STAGES:
+            row += f'{result.stages[stage].seconds:>12.4f}{result.stages[stage].peak_bytes / 1024:>14.1f}'
+        print(row)
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark schedule generation, verification and export.")
+    parser.add_argument('--grid', choices=sorted(GRIDS), default='quick')
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage; the fastest is kept")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--exact', action='store_true', help="benchmark ExactAssignmentGenerator")
+    parser.add_argument('--save-baseline', help="write results to this JSON file")
+    parser.add_argument('--compare', help="fail if results regress against this baseline JSON file")
+    parser.add_argument('--time-tolerance', type=float, default=1.5)
+    parser.add_argument('--memory-tolerance', type=float, default=1.25)
+    parser.add_argument('--startup', action='store_true',
+                        help="only check that the scheduling core imports within --startup-budget and without pandas")
+    parser.add_argument('--startup-budget', type=float, default=STARTUP_BUDGET_SECONDS)
+    parser.add_argument('--known-failures', action='store_true',
+                        help="only check that shapes an engine once failed to schedule now verify")
+    args = parser.parse_args(argv)
+
+    if args.startup:
+        seconds, loaded = measure_startup(repeat=args.repeat)
+        print(f"Core import: {seconds:.3f}s (budget {args.startup_budget:.3f}s)")
+        if loaded:
+            print(f"Regression: importing the core loaded {', '.join(loaded)}")
+        if seconds > args.startup_budget:
+            print(f"Regression: core import took {seconds:.3f}s")
+        return 1 if loaded or seconds > args.startup_budget else 0
+
+    if args.known_failures:
+        failures = check_known_failures(seed=args.seed)
+        for failure in failures:
+            print("Regression: " + failure)
+        if not failures:
+            print(f"All {len(KNOWN_FAILURES)} known failure shapes verify")
+        return 1 if failures else 0
+
+    results = run_grid(args.grid, seed=args.seed, repeat=args.repeat, exact=args.exact)
+    print_results(results)
+
+    if args.save_baseline:
+        save_baseline(results, args.save_baseline)
+        print(f"Saved baseline to '{args.save_baseline}'")
+    if args.compare:
+        regressions = compare_to_baseline(results, args.compare, args.time_tolerance, args.memory_tolerance)
+        for regression in regressions:
+            print("Regression: " + regression)
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
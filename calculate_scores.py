@@ -1,33 +1,189 @@
 #!/usr/bin/env python3
+import argparse
+import numpy as np
 import pandas as pd
+from score_log import ScoreLog, group_log, standardized_points
 
-# Load the data
-points = pd.read_csv('points.csv')
-teams = pd.read_csv('teams.csv')
+def aggregate_points(points: pd.DataFrame, teams: pd.DataFrame) -> pd.DataFrame:
+    # Standardize the points for each judge
+    points['standardizedPoints'] = points.groupby('judgeNumber')['points'].transform(
+        lambda x: (x - x.mean()) / x.std()
+    )
 
-# Standardize the points for each judge
-points['standardizedPoints'] = points.groupby('judgeNumber')['points'].transform(
-    lambda x: (x - x.mean()) / x.std()
-)
+    # Group by tableNumber, calculate the average standardized points and count how many judges saw each team
+    points_grouped = points.groupby('tableNumber').agg(
+        standardizedPoints=('standardizedPoints', 'mean'),
+        judgeCount=('judgeNumber', 'nunique')  # Count the unique judges
+    ).reset_index()
 
-# Group by tableNumber, calculate the average standardized points and count how many judges saw each team
-points_grouped = points.groupby('tableNumber').agg(
-    standardizedPoints=('standardizedPoints', 'mean'),
-    judgeCount=('judgeNumber', 'nunique')  # Count the unique judges
-).reset_index()
+    return sort_and_label(points_grouped, teams)
 
-# Sort by points in ascending order
-sorted_points = points_grouped.sort_values(by='standardizedPoints', ascending=False)
+def sort_and_label(points_grouped: pd.DataFrame, teams: pd.DataFrame) -> pd.DataFrame:
+    # Sort by points in ascending order
+    sorted_points = points_grouped.sort_values(by='standardizedPoints', ascending=False)
 
-# Add in the team names
-# Assuming 'teams' is another DataFrame with a 'teamName' column and an index corresponding to 'tableNumber'
-sorted_points = sorted_points.merge(teams[['tableNumber', 'teamName']], on='tableNumber', how='left')
+    # Add in the team names
+    # Assuming 'teams' is another DataFrame with a 'teamName' column and an index corresponding to 'tableNumber'
+    sorted_points = sorted_points.merge(teams[['tableNumber', 'teamName']], on='tableNumber', how='left')
 
-# Reset the index
-sorted_points = sorted_points.reset_index(drop=True)
+    # Reset the index
+    return sorted_points.reset_index(drop=True)
 
-# Display the final sorted DataFrame
-sorted_points
+def _combine_judge_stats(total: pd.DataFrame, chunk: pd.DataFrame) -> pd.DataFrame:
+    # Chan et al. parallel form of Welford's update: merge per-judge (n, mean, M2) of two batches
+    total, chunk = total.align(chunk, fill_value=0)
+    n = total['n'] + chunk['n']
+    delta = chunk['mean'] - total['mean']
+    safe_n = n.where(n > 0, 1)
+    return pd.DataFrame({
+        'n': n,
+        'mean': total['mean'] + delta * chunk['n'] / safe_n,
+        'M2': total['M2'] + chunk['M2'] + delta ** 2 * total['n'] * chunk['n'] / safe_n,
+    })
 
-# save the sorted points to a csv
-sorted_points.to_csv('aggregated_and_sorted_points.csv')
\ No newline at end of file
+def aggregate_points_streaming(points_path: str, teams: pd.DataFrame, chunksize: int = 1_000_000) -> pd.DataFrame:
+    """
+    Same result as aggregate_points, reading points_path in chunks.
+
+    A judge's mean and standard deviation are only known after the last row,
+    so instead of per-row standardized scores this keeps per-judge online
+    (n, mean, M2) and per (table, judge) point sums and counts. The table's
+    mean standardized score is sum((S - c * mean) / std) / sum(c) over its
+    judges. Memory grows with judges and judgings, not with score rows.
+    """
+    judge_stats = pd.DataFrame({'n': pd.Series(dtype=float), 'mean': pd.Series(dtype=float), 'M2': pd.Series(dtype=float)})
+    # Float columns on an empty (table, judge) index, so a header-only file gives the same empty result as aggregate_points
+    pair_sums = pd.DataFrame({'sum': pd.Series(dtype=float), 'count': pd.Series(dtype=float)},
+                             index=pd.MultiIndex.from_arrays([[], []], names=['tableNumber', 'judgeNumber']))
+
+    for chunk in pd.read_csv(points_path, usecols=['judgeNumber', 'tableNumber', 'points'], chunksize=chunksize):
+        if chunk.empty:
+            # A header-only file still yields one chunk, with object columns
+            continue
+        by_judge = chunk.groupby('judgeNumber')['points'].agg(['count', 'mean', 'var'])
+        chunk_stats = pd.DataFrame({
+            'n': by_judge['count'].astype(float),
+            'mean': by_judge['mean'].fillna(0.0),
+            'M2': (by_judge['var'] * (by_judge['count'] - 1)).fillna(0.0),
+        })
+        judge_stats = _combine_judge_stats(judge_stats, chunk_stats)
+
+        chunk_pairs = chunk.groupby(['tableNumber', 'judgeNumber'])['points'].agg(['sum', 'count'])
+        pair_sums = pair_sums.add(chunk_pairs, fill_value=0) if len(pair_sums) else chunk_pairs.astype(float)
+
+    # Sample standard deviation, as pandas' std(); judges with one score or no spread standardize to NaN
+    std = np.sqrt(judge_stats['M2'] / (judge_stats['n'] - 1).where(judge_stats['n'] > 1))
+    std = std.where(std > 0)
+
+    judges = pair_sums.index.get_level_values('judgeNumber')
+    pair_std = std.reindex(judges).to_numpy()
+    pair_mean = judge_stats['mean'].reindex(judges).to_numpy()
+    valid = ~np.isnan(pair_std) & (pair_sums['count'].to_numpy() > 0)
+    standardized_sum = np.where(valid, (pair_sums['sum'].to_numpy() - pair_sums['count'].to_numpy() * pair_mean) / np.where(valid, pair_std, 1), 0.0)
+    standardized_count = np.where(valid, pair_sums['count'].to_numpy(), 0.0)
+
+    per_table = pd.DataFrame({
+        'standardizedSum': standardized_sum,
+        'standardizedCount': standardized_count,
+    }, index=pair_sums.index.get_level_values('tableNumber')).groupby(level=0).sum()
+
+    points_grouped = pd.DataFrame({
+        'tableNumber': per_table.index,
+        'standardizedPoints': (per_table['standardizedSum'] / per_table['standardizedCount'].where(per_table['standardizedCount'] > 0)).to_numpy(),
+        'judgeCount': pair_sums.groupby(level='tableNumber').size().reindex(per_table.index).to_numpy(),
+    })
+    return sort_and_label(points_grouped, teams)
+
+def aggregate_log(records: np.ndarray, teams: pd.DataFrame) -> pd.DataFrame:
+    # Same result as aggregate_points, over a score log's memory-mapped records
+    return sort_and_label(group_log(records), teams)
+
+def bootstrap_rankings(points: pd.DataFrame, resamples: int = 10_000, top_k: int = 10, confidence: float = 0.95,
+                       seed: int = None, batch_size: int = 500) -> pd.DataFrame:
+    """
+    Bootstraps each table's mean standardized score by resampling, with
+    replacement, the standardized scores its judges gave it. Returns per-table
+    confidence bounds and the share of resamples in which the table ranks in
+    the top K. Resamples are drawn in batches of whole arrays, never one at a time.
+    """
+    scored = points.dropna(subset=['standardizedPoints'])
+    tables, codes = np.unique(scored['tableNumber'].to_numpy(), return_inverse=True)
+    num_tables = len(tables)
+    if num_tables == 0:
+        return pd.DataFrame(columns=['tableNumber', 'ciLow', 'ciHigh', 'topKProbability'])
+
+    # Pad each table's scores into one row of a tables x max_scores array
+    counts = np.bincount(codes, minlength=num_tables)
+    order = np.argsort(codes, kind='stable')
+    offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    max_scores = counts.max()
+    values = np.zeros((num_tables, max_scores))
+    values[codes[order], np.arange(len(order)) - offsets[codes[order]]] = scored['standardizedPoints'].to_numpy()[order]
+    flat_values = values.ravel()
+    row_starts = (np.arange(num_tables) * max_scores)[None, :, None]
+    valid = np.arange(max_scores)[None, None, :] < counts[None, :, None]
+
+    rng = np.random.default_rng(seed)
+    k = min(top_k, num_tables)
+    means = np.empty((resamples, num_tables), dtype=np.float32)
+    top_hits = np.zeros(num_tables, dtype=np.int64)
+    for start in range(0, resamples, batch_size):
+        size = min(batch_size, resamples - start)
+        picks = (rng.random((size, num_tables, max_scores)) * counts[None, :, None]).astype(np.intp)
+        sample = np.where(valid, flat_values[row_starts + picks], 0.0)
+        batch_means = sample.sum(axis=2) / counts
+        means[start:start + size] = batch_means
+        top = np.argpartition(-batch_means, k - 1, axis=1)[:, :k]
+        top_hits += np.bincount(top.ravel(), minlength=num_tables)
+
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha], axis=0)
+    return pd.DataFrame({
+        'tableNumber': tables,
+        'ciLow': low,
+        'ciHigh': high,
+        'topKProbability': top_hits / resamples,
+    })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rank teams by their mean per-judge standardized score.")
+    parser.add_argument('--points', default='points.csv')
+    parser.add_argument('--teams', default='teams.csv')
+    parser.add_argument('--log', help="read scores from this binary score log instead of --points")
+    parser.add_argument('--output', default='aggregated_and_sorted_points.csv')
+    parser.add_argument('--stream', action='store_true', help="aggregate points in chunks with bounded memory")
+    parser.add_argument('--chunksize', type=int, default=1_000_000, help="score rows per chunk in --stream mode")
+    parser.add_argument('--bootstrap', type=int, metavar='RESAMPLES',
+                        help="add bootstrap confidence intervals and top-K probabilities from this many resamples")
+    parser.add_argument('--top-k', type=int, default=10, help="cutoff rank for the top-K probability")
+    parser.add_argument('--confidence', type=float, default=0.95)
+    parser.add_argument('--seed', type=int, help="seed for reproducible bootstrap resamples")
+    args = parser.parse_args(argv)
+    if args.stream and args.bootstrap:
+        parser.error("--bootstrap needs per-score standardized points and cannot be combined with --stream")
+    if args.stream and args.log:
+        parser.error("--stream reads points.csv in chunks; a score log is already read without loading it")
+
+    # Load the data
+    teams = pd.read_csv(args.teams)
+    if args.log:
+        records = ScoreLog(args.log).records()
+        sorted_points = aggregate_log(records, teams)
+        if args.bootstrap:
+            points = pd.DataFrame({'tableNumber': records['table'], 'standardizedPoints': standardized_points(records)})
+            intervals = bootstrap_rankings(points, args.bootstrap, args.top_k, args.confidence, args.seed)
+            sorted_points = sorted_points.merge(intervals, on='tableNumber', how='left')
+    elif args.stream:
+        sorted_points = aggregate_points_streaming(args.points, teams, args.chunksize)
+    else:
+        points = pd.read_csv(args.points)
+        sorted_points = aggregate_points(points, teams)
+        if args.bootstrap:
+            intervals = bootstrap_rankings(points, args.bootstrap, args.top_k, args.confidence, args.seed)
+            sorted_points = sorted_points.merge(intervals, on='tableNumber', how='left')
+
+    # save the sorted points to a csv
+    sorted_points.to_csv(args.output)
+
+if __name__ == "__main__":
+    main()
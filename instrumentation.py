@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+from contextlib import contextmanager
+from typing import Dict, List
+import json
+import time
+import tracemalloc
+
+class RunReport:
+    """
+    Opt-in record of timing spans, allocation peaks and counters for one run.
+    Spans nest; with track_memory, each span records the tracemalloc peak
+    reached while it was open, relative to the allocations live on entry.
+    """
+
+    def __init__(self, track_memory: bool = False):
+        self.track_memory = track_memory
+        self.spans: List[Dict] = []
+        self.counters: Dict[str, int] = {}
+        self._stack: List[Dict] = []
+        self._started_tracing = False
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        record = {'name': name, 'depth': len(self._stack), **attributes}
+        self.spans.append(record)
+        if self.track_memory:
+            self._enter_memory(record)
+        self._stack.append(record)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start
+            self._stack.pop()
+            if self.track_memory:
+                self._exit_memory(record)
+
+    def _enter_memory(self, record: Dict):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # Fold the peak reached so far into the enclosing span before resetting it
+            parent = self._stack[-1]
+            parent['_peak'] = max(parent['_peak'], peak)
+        tracemalloc.reset_peak()
+        record['_start'] = current
+        record['_peak'] = current
+
+    def _exit_memory(self, record: Dict):
+        peak = max(record.pop('_peak'), tracemalloc.get_traced_memory()[1])
+        record['peak_bytes'] = peak - record.pop('_start')
+        tracemalloc.reset_peak()
+        if self._stack:
+            self._stack[-1]['_peak'] = max(self._stack[-1]['_peak'], peak)
+        elif self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def stage_seconds(self, name: str) -> float:
+        return sum(span['seconds'] for span in self.spans if span['name'] == name and 'seconds' in span)
+
+    def to_dict(self) -> Dict:
+        return {'spans': [dict(span) for span in self.spans], 'counters': dict(self.counters)}
+
+    def to_json(self, path: str = None) -> str:
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+class NullReport(RunReport):
+    # Default for uninstrumented runs: spans and counters are no-ops
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        yield None
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+NULL_REPORT = NullReport()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+from typing import TYPE_CHECKING, Tuple
+import numpy as np
+from assignment_matrix import AssignmentMatrix
+from roster_loader import RosterError
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+CONFLICT = 'conflict'
+AFFINITY = 'affinity'
+CONSTRAINT_COLUMNS = ['judgeId', 'tableNumber', 'constraint']
+
+class JudgeConstraints:
+    """
+    Hard judge-project conflicts (a judge mentors a team) and soft affinities
+    (a judge should preferably see a team), held as one packed bitset over
+    project ids per judge. Bit p of a judge's row is project id p, so testing
+    a placement is a single byte lookup however many pairs were loaded.
+    """
+
+    def __init__(self, num_judges: int, num_projects: int):
+        self.num_projects = num_projects
+        width = (num_projects + 1 + 7) // 8
+        self.conflict_bits = np.zeros((num_judges, width), dtype=np.uint8)
+        self.affinity_bits = np.zeros((num_judges, width), dtype=np.uint8)
+
+    @property
+    def num_judges(self) -> int:
+        return self.conflict_bits.shape[0]
+
+    def _bits(self, kind: str) -> np.ndarray:
+        if kind == CONFLICT:
+            return self.conflict_bits
+        if kind == AFFINITY:
+            return self.affinity_bits
+        raise ValueError(f"Unknown constraint '{kind}' (expected '{CONFLICT}' or '{AFFINITY}')")
+
+    def add(self, kind: str, judges: np.ndarray, projects: np.ndarray):
+        # judges are 0-based row indices, projects are project ids
+        judges = np.asarray(judges, dtype=np.intp)
+        projects = np.asarray(projects, dtype=np.intp)
+        np.bitwise_or.at(self._bits(kind), (judges, projects >> 3), (1 << (projects & 7)).astype(np.uint8))
+
+    def _unpack(self, bits: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bits, count=self.num_projects + 1, bitorder='little').view(bool)
+
+    def conflict_mask(self, judge: int) -> np.ndarray:
+        # Boolean mask indexed by project id; judges added after loading have no constraints
+        if judge >= self.num_judges:
+            return np.zeros(self.num_projects + 1, dtype=bool)
+        return self._unpack(self.conflict_bits[judge])
+
+    def affinity_mask(self, judge: int) -> np.ndarray:
+        if judge >= self.num_judges or not self.affinity_bits[judge].any():
+            return None
+        return self._unpack(self.affinity_bits[judge])
+
+    def conflicts(self, judge: int, project: int) -> bool:
+        if judge >= self.num_judges:
+            return False
+        return bool((self.conflict_bits[judge, project >> 3] >> (project & 7)) & 1)
+
+    def project_conflicts(self, project: int, num_judges: int = None) -> np.ndarray:
+        # Judges (rows) who may not judge project, padded with False up to num_judges
+        column = ((self.conflict_bits[:, project >> 3] >> (project & 7)) & 1).astype(bool)
+        if num_judges is not None and num_judges > len(column):
+            column = np.concatenate([column, np.zeros(num_judges - len(column), dtype=bool)])
+        return column
+
+    def _cells_matching(self, bits: np.ndarray, matrix: AssignmentMatrix) -> Tuple[np.ndarray, np.ndarray]:
+        judges, slots = np.nonzero(matrix.filled_mask()[:self.num_judges])
+        projects = matrix.data[judges, slots].astype(np.intp)
+        hit = ((bits[judges, projects >> 3] >> (projects & 7)) & 1).astype(bool)
+        return judges[hit], slots[hit]
+
+    def conflicted_cells(self, matrix: AssignmentMatrix) -> Tuple[np.ndarray, np.ndarray]:
+        # (judges, slots) of every scheduled judging that breaks a conflict
+        return self._cells_matching(self.conflict_bits, matrix)
+
+    def affinity_cells(self, matrix: AssignmentMatrix) -> Tuple[np.ndarray, np.ndarray]:
+        return self._cells_matching(self.affinity_bits, matrix)
+
+    def counts(self) -> Tuple[int, int]:
+        return (int(np.unpackbits(self.conflict_bits).sum()), int(np.unpackbits(self.affinity_bits).sum()))
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame', judge_ids: np.ndarray, table_numbers: np.ndarray, source: str = 'constraints') -> 'JudgeConstraints':
+        """
+        df has one row per pair: judgeId (as in the schedule's Judge ID
+        column), tableNumber and constraint ('conflict' or 'affinity').
+        """
+        import pandas as pd
+        missing = [column for column in CONSTRAINT_COLUMNS if column not in df.columns]
+        if missing:
+            raise RosterError(f"'{source}' is missing required columns: {', '.join(missing)}")
+        judge_rows = pd.Series(np.arange(len(judge_ids)), index=judge_ids)
+        project_ids = pd.Series(np.arange(1, len(table_numbers) + 1), index=table_numbers)
+        judges = pd.to_numeric(df['judgeId'], errors='coerce').map(judge_rows)
+        projects = pd.to_numeric(df['tableNumber'], errors='coerce').map(project_ids)
+        kinds = df['constraint'].astype(str).str.strip().str.lower()
+
+        for name, values in (('judgeId', judges), ('tableNumber', projects)):
+            unknown = np.flatnonzero(values.isna().to_numpy())
+            if len(unknown):
+                rows = ', '.join(str(row + 2) for row in unknown[:10].tolist())
+                raise RosterError(f"'{source}' has unknown {name} values on line(s) {rows}")
+        invalid = np.flatnonzero(~kinds.isin([CONFLICT, AFFINITY]).to_numpy())
+        if len(invalid):
+            rows = ', '.join(str(row + 2) for row in invalid[:10].tolist())
+            raise RosterError(f"'{source}' has constraints other than '{CONFLICT}' or '{AFFINITY}' on line(s) {rows}")
+
+        constraints = cls(len(judge_ids), len(table_numbers))
+        judges = judges.to_numpy(dtype=np.intp)
+        projects = projects.to_numpy(dtype=np.intp)
+        for kind in (CONFLICT, AFFINITY):
+            selected = (kinds == kind).to_numpy()
+            constraints.add(kind, judges[selected], projects[selected])
+        return constraints
+
+    @classmethod
+    def from_csv(cls, path: str, judge_ids: np.ndarray, table_numbers: np.ndarray) -> 'JudgeConstraints':
+        import pandas as pd
+        return cls.from_dataframe(pd.read_csv(path, dtype={'constraint': str}), judge_ids, table_numbers, path)
@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
 from dataclasses import dataclass
-from typing import List, Dict, Set, Tuple
+from typing import TYPE_CHECKING, List, Dict, Optional, Sequence, Set, Tuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+import argparse
+import heapq
 import math
 import random
-import pandas as pd
+import numpy as np
 import string
+import time
+from assignment_export import AssignmentExporter
+from assignment_matrix import AssignmentMatrix, EMPTY
+from instrumentation import NULL_REPORT, RunReport
+from judge_constraints import JudgeConstraints
+from overlap_metrics import graph_metrics
+from roster_loader import RosterCache, load_judges, load_teams
+from roster_store import JudgeStore, ProjectStore, RoomStore
+from schedule_optimizer import LocalSearchOptimizer
+from template_cache import TemplateCache, TemplateKey
+from venue_travel import DEFAULT_SLOT_MINUTES, TravelModel
 
-@dataclass
-class Project:
-    name: str
-    table_number: int
+# pandas is only imported where a DataFrame or pandas-based CSV read is needed
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Parsed rosters shared by every JudgingSystem in this process, keyed by file content
+DEFAULT_ROSTER_CACHE = RosterCache()
+# Extra same-count candidates _pick_team looks at for a judge's preferred team
+AFFINITY_LOOKAHEAD = 8
+# Same-count candidates OverlapAwareAssignmentGenerator compares per placement
+OVERLAP_LOOKAHEAD = 8
 
 @dataclass
 class Judge:
@@ -18,99 +38,111 @@ class Judge:
     judge_id: int
 
 @dataclass
-class Room:
-    room_id: int
-    projects: List[int]
+class VerificationIssue:
+    kind: str
+    slot: Optional[int] = None
+    table: Optional[int] = None
+    judge: Optional[int] = None
+    count: Optional[int] = None
 
 class JudgingSystem:
-    def __init__(self, num_rooms: int, judgings_per_project: int, demo_mode: bool = False, num_judges: int = None, total_projects: int = None,):
+    def __init__(self, num_rooms: int, judgings_per_project: int, demo_mode: bool = False, num_judges: int = None, total_projects: int = None,
+                 judges_path: str = 'judges.csv', projects_path: str = 'team.csv', report: RunReport = None,
+                 roster_cache: RosterCache = DEFAULT_ROSTER_CACHE, constraints_path: str = None):
+        self.report = report if report is not None else NULL_REPORT
+        self.roster_cache = roster_cache
+        self.judges_path = judges_path
+        self.projects_path = projects_path
         self.num_judges = num_judges if demo_mode else 0
         self.total_projects = total_projects if demo_mode else 0
         self.num_rooms = num_rooms
         self.judgings_per_project = judgings_per_project
         self.demo_mode = demo_mode
         
-        self.judges = self._initialize_judges()
-        self.projects = self._initialize_projects()
+        source = 'demo' if demo_mode else 'csv'
+        with self.report.span('load_judges', source=source):
+            self.judges = self._initialize_judges()
+        with self.report.span('load_projects', source=source):
+            self.projects = self._initialize_projects()
         self.rooms = self._create_rooms()
+        # Hard judge-project conflicts and soft affinities, or None when unconstrained
+        self.constraints: Optional[JudgeConstraints] = None
+        if constraints_path:
+            with self.report.span('load_constraints'):
+                self.constraints = JudgeConstraints.from_csv(constraints_path, self.judges.judge_ids, self.projects.table_numbers)
+        
+    @classmethod
+    def from_stores(cls, judges: JudgeStore, projects: ProjectStore, num_rooms: int, judgings_per_project: int,
+                    report: RunReport = None) -> 'JudgingSystem':
+        # A system around rosters already in memory, e.g. one track of a multi-track event
+        system = cls.__new__(cls)
+        system.report = report if report is not None else NULL_REPORT
+        system.roster_cache = None
+        system.judges_path = None
+        system.projects_path = None
+        system.num_judges = len(judges)
+        system.total_projects = len(projects)
+        system.num_rooms = num_rooms
+        system.judgings_per_project = judgings_per_project
+        system.demo_mode = False
+        system.judges = judges
+        system.projects = projects
+        system.rooms = system._create_rooms()
+        system.constraints = None
+        return system
         
-    def _initialize_judges(self) -> List[Judge]:
+    def _initialize_judges(self) -> JudgeStore:
         if self.demo_mode:
             return self._generate_demo_judges()
         return self._load_judges_from_csv()
     
-    def _initialize_projects(self) -> List[Project]:
+    def _initialize_projects(self) -> ProjectStore:
         if self.demo_mode:
             return self._generate_demo_projects()
         return self._load_projects_from_csv()
     
-    def _generate_demo_judges(self) -> List[Judge]:
+    def _generate_demo_judges(self) -> JudgeStore:
         first_names = ['John', 'Jane', 'Mary', 'James', 'Patricia', 'Michael', 'Linda', 'Robert', 'Elizabeth', 'William', 'Jessica', 'David', 'Sarah', 'Thomas']
         last_names = ['Smith', 'Johnson', 'Williams', 'Brown', 'Jones', 'Garcia', 'Miller', 'Davis', 'Rodriguez', 'Martinez', 'Hernandez', 'Lopez', 'Gonzalez', 'Wilson']
-        judges = []
-        for i in range(self.num_judges):
-            judge = Judge(
-                first_name=random.choice(first_names),
-                last_name=random.choice(last_names),
-                judge_id=1001 + i
-            )
-            judges.append(judge)
-        return judges
-    
-    def _generate_demo_projects(self) -> List[Project]:
-        projects = []
-        for i in range(self.total_projects):
-            project = Project(
-                name=''.join(random.choices(string.ascii_lowercase, k=3)),
-                table_number=i + 1
-            )
-            projects.append(project)
-        return projects
-    
-    def _load_judges_from_csv(self) -> List[Judge]:
-        df = pd.read_csv('judges.csv')
-        self.num_judges = len(df)
-        judges = []
-        for i, row in df.iterrows():
-            judge = Judge(
-                first_name=row['judgeFirstName'],
-                last_name=row['judgeLastName'],
-                judge_id=1001 + i
-            )
-            judges.append(judge)
-        return judges
-    
-    def _load_projects_from_csv(self) -> List[Project]:
-        df = pd.read_csv('team.csv')
-        self.total_projects = len(df)
-        projects = []
-        for _, row in df.iterrows():
-            project = Project(
-                name=row['teamName'],
-                table_number=row['tableNumber']
-            )
-            projects.append(project)
-        return projects
+        judge_first_names = []
+        judge_last_names = []
+        for _ in range(self.num_judges):
+            judge_first_names.append(random.choice(first_names))
+            judge_last_names.append(random.choice(last_names))
+        return JudgeStore(judge_first_names, judge_last_names)
+    
+    def _generate_demo_projects(self) -> ProjectStore:
+        names = [''.join(random.choices(string.ascii_lowercase, k=3)) for _ in range(self.total_projects)]
+        return ProjectStore(names, np.arange(1, self.total_projects + 1))
+    
+    def _load_judges_from_csv(self) -> JudgeStore:
+        roster = load_judges(self.judges_path, self.roster_cache)
+        self.num_judges = len(roster)
+        return JudgeStore(roster.first_names.tolist(), roster.last_names.tolist())
+    
+    def _load_projects_from_csv(self) -> ProjectStore:
+        roster = load_teams(self.projects_path, self.roster_cache)
+        self.total_projects = len(roster)
+        return ProjectStore(roster.names.tolist(), roster.table_numbers)
     
-    def _create_rooms(self) -> List[Room]:
+    def _create_rooms(self) -> RoomStore:
+        # Room i holds the contiguous block of project ids offsets[i] + 1 .. offsets[i + 1]
         projects_per_room = math.ceil(self.total_projects / self.num_rooms)
-        rooms = []
-        for i in range(self.num_rooms):
-            start_idx = i * projects_per_room + 1
-            end_idx = min((i + 1) * projects_per_room + 1, self.total_projects + 1)
-            room = Room(
-                room_id=i + 1,
-                projects=list(range(start_idx, end_idx))
-            )
-            rooms.append(room)
-        return rooms
+        offsets = np.minimum(np.arange(self.num_rooms + 1) * projects_per_room, self.total_projects)
+        return RoomStore(offsets)
 
 class AssignmentGenerator:
-    def __init__(self, system: JudgingSystem):
+    def __init__(self, system: JudgingSystem, seed: int = None, report: RunReport = None):
         self.system = system
-        self.assignments = []
+        self.report = report if report is not None else system.report
+        # Seeded attempts get their own RNG so they can be reproduced exactly
+        self.seed = seed
+        self.rng = random.Random(seed) if seed is not None else random
         self.project_counts = {i: 0 for i in range(1, system.total_projects + 1)}
         self.judge_counts = {i: 0 for i in range(system.num_judges)}
+        # Work counters, published to the report after each generation
+        self.candidates_scanned = 0
+        self.cross_room_fallbacks = 0
         
         # Calculate total judgings needed
         self.total_judgings = system.total_projects * system.judgings_per_project
@@ -128,194 +160,980 @@ class AssignmentGenerator:
         self.initial_room_assignments = []
         for room_idx in range(system.num_rooms):
             self.initial_room_assignments.extend([room_idx] * self.judges_per_room[room_idx])
-        random.shuffle(self.initial_room_assignments)
+        self.rng.shuffle(self.initial_room_assignments)
         
         # Calculate assignments per phase
         self.max_per_judge = self.base_per_judge + (1 if self.extra_assignments > 0 else 0)
         self.teams_per_phase = math.ceil(self.max_per_judge / system.num_rooms)
+        
+        # A judge never needs more slots than one full pass through every room
+        self.assignments = AssignmentMatrix.empty(
+            system.num_judges, system.num_rooms * self.teams_per_phase, system.total_projects
+        )
 
     def _get_target_assignments(self, judge_id: int) -> int:
         # First extra_assignments judges get one extra assignment
         return self.base_per_judge + (1 if judge_id < self.extra_assignments else 0)
 
+    def _init_placement_index(self):
+        # Teams already placed in each time slot, across all judges so far
+        self.slot_occupancy: List[Set[int]] = []
+        # Per-room min-heaps of (project_count, team); stale entries are skipped lazily
+        self.room_heaps: List[List[Tuple[int, int]]] = []
+        self.team_room: Dict[int, int] = {}
+        for room_idx, room in enumerate(self.system.rooms):
+            heap = [(self.project_counts[team], team) for team in room.projects]
+            heapq.heapify(heap)
+            self.room_heaps.append(heap)
+            for team in room.projects:
+                self.team_room[team] = room_idx
+
+    def _slot_teams(self, slot: int) -> Set[int]:
+        while len(self.slot_occupancy) <= slot:
+            self.slot_occupancy.append(set())
+        return self.slot_occupancy[slot]
+
+    def _pick_team(self, room_idx: int, current_slot_assignments: Set[int], excluded: Set[int] = frozenset(),
+                   blocked: np.ndarray = None, preferred: np.ndarray = None) -> int:
+        """
+        Returns the least-judged team in the room (lowest table number on ties)
+        that is available in the current slot, not excluded and not blocked for
+        the judge, or -1 if none. With a preferred mask, the next few teams at
+        the same judging count are also looked at and a preferred one wins.
+        """
+        heap = self.room_heaps[room_idx]
+        skipped = []
+        team = -1
+        team_count = None
+        lookahead = 0
+        while heap:
+            self.candidates_scanned += 1
+            count, candidate = heap[0]
+            if count != self.project_counts[candidate] or count >= self.system.judgings_per_project:
+                heapq.heappop(heap)
+                continue
+            if (candidate in current_slot_assignments or candidate in excluded
+                    or (blocked is not None and blocked[candidate])):
+                skipped.append(heapq.heappop(heap))
+                continue
+            if preferred is None or preferred[candidate]:
+                if team == -1 or count == team_count:
+                    team = candidate
+                break
+            # Not preferred: keep the first such team as the answer, but look a little further at the same count
+            if team == -1:
+                team, team_count = candidate, count
+            elif count != team_count or lookahead >= AFFINITY_LOOKAHEAD:
+                break
+            lookahead += 1
+            skipped.append(heapq.heappop(heap))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return team
+
+    def _place_team(self, team: int):
+        self.project_counts[team] += 1
+        count = self.project_counts[team]
+        if count < self.system.judgings_per_project:
+            heapq.heappush(self.room_heaps[self.team_room[team]], (count, team))
+
+    def _phase_room(self, start_room: int, phase: int) -> int:
+        return (start_room + phase) % self.system.num_rooms
+
+    def _start_judge(self, judge_id: int):
+        # Hook for generators that track per-judge state while a schedule is built
+        pass
+
+    def _judge_masks(self, judge_id: int) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        # Per-judge (conflict, affinity) masks over project ids, unpacked once per judge
+        constraints = self.system.constraints
+        if constraints is None:
+            return None, None
+        return constraints.conflict_mask(judge_id), constraints.affinity_mask(judge_id)
+
+    def _fallback_rooms(self, current_room: int) -> Sequence[int]:
+        return range(self.system.num_rooms)
+
     def _create_balanced_assignments(self):
+        self._init_placement_index()
+        num_slots = 0
         for judge_id in range(self.system.num_judges):
-            judge_assignments = []
+            judge_assignments = self.assignments.data[judge_id]
+            current_slot = 0
             start_room = self.initial_room_assignments[judge_id]
             target_assignments = self._get_target_assignments(judge_id)
             remaining_assignments = target_assignments
+            blocked, preferred = self._judge_masks(judge_id)
+            self._start_judge(judge_id)
             
             for phase in range(self.system.num_rooms):
-                current_room = (start_room + phase) % self.system.num_rooms
-                room_teams = self.system.rooms[current_room].projects.copy()
+                current_room = self._phase_room(start_room, phase)
+                # Teams this judge has already seen in the current room during this phase
+                judged_in_room = set()
                 slots_this_phase = min(self.teams_per_phase, remaining_assignments)
                 
                 for slot in range(slots_this_phase):
-                    current_slot = len(judge_assignments)
-                    current_slot_assignments = set()
-                    
-                    for prev_judge_assignments in self.assignments:
-                        if current_slot < len(prev_judge_assignments):
-                            current_slot_assignments.add(prev_judge_assignments[current_slot])
+                    current_slot_assignments = self._slot_teams(current_slot)
                     
-                    available_teams = self._get_available_teams(room_teams, current_slot_assignments)
+                    team = self._pick_team(current_room, current_slot_assignments, judged_in_room, blocked, preferred)
                     
-                    if not available_teams:
-                        for other_room in self.system.rooms:
-                            if other_room.projects != room_teams:
-                                available_teams = self._get_available_teams(
-                                    other_room.projects,
-                                    current_slot_assignments
-                                )
-                                if available_teams:
-                                    break
+                    if team == -1:
+                        # Fall back to other rooms; the current room is only skipped
+                        # while none of its teams have been taken this phase
+                        self.cross_room_fallbacks += 1
+                        for other_idx in self._fallback_rooms(current_room):
+                            if other_idx == current_room and not judged_in_room:
+                                continue
+                            team = self._pick_team(other_idx, current_slot_assignments, blocked=blocked, preferred=preferred)
+                            if team != -1:
+                                break
                     
-                    if available_teams:
-                        team = min(available_teams, key=lambda t: self.project_counts[t])
-                        judge_assignments.append(team)
-                        self.project_counts[team] += 1
+                    judge_assignments[current_slot] = team
+                    if team != -1:
+                        self._place_team(team)
                         self.judge_counts[judge_id] += 1
                         remaining_assignments -= 1
-                        if team in room_teams:
-                            room_teams.remove(team)
-                    else:
-                        judge_assignments.append(-1)
+                        if self.team_room[team] == current_room:
+                            judged_in_room.add(team)
+                    current_slot_assignments.add(team)
+                    current_slot += 1
             
-            self.assignments.append(judge_assignments)
+            num_slots = max(num_slots, current_slot)
+        
+        self.assignments = self.assignments.trimmed(num_slots)
+
+    def _project_labels(self) -> np.ndarray:
+        # Display label per project id, with the empty-cell label in the last position
+        labels = self.system.projects.labels()
+        labels.append('No team for this time slot')
+        return np.array(labels, dtype=object)
+
+    def _create_assignment_dataframe(self) -> 'pd.DataFrame':
+        import pandas as pd
+        data = self.assignments.data
+        labels = self._project_labels()
+        cells = labels[np.where(data == EMPTY, len(labels) - 1, data - 1)]
+        
+        judge_names = self.system.judges.full_names()
+        df = pd.DataFrame(
+            cells,
+            index=pd.Index(judge_names, name='Judge'),
+            columns=[f'Slot {i+1}' for i in range(self.assignments.num_slots)]
+        )
+        
+        # Add judge information
+        df.insert(0, 'Judge ID', range(1001, 1001 + len(df)))
+        
+        return df
+
+    def _report_counters(self):
+        self.report.count('candidates_scanned', self.candidates_scanned)
+        self.report.count('cross_room_fallbacks', self.cross_room_fallbacks)
+        self.report.count('idle_slots', self.assignments.idle_cells())
+        if self.system.constraints is not None:
+            self.report.count('affinity_matches', len(self.system.constraints.affinity_cells(self.assignments)[0]))
+
+    def generate_matrix(self) -> AssignmentMatrix:
+        with self.report.span('create_balanced_assignments', engine=type(self).__name__):
+            self._create_balanced_assignments()
+        self._report_counters()
+        return self.assignments
+
+    def generate_assignments(self) -> 'pd.DataFrame':
+        self.generate_matrix()
+        with self.report.span('create_assignment_dataframe'):
+            return self._create_assignment_dataframe()
+
+class TravelAwareAssignmentGenerator(AssignmentGenerator):
+    """
+    AssignmentGenerator for venues where walking between rooms costs judging
+    time. Judges rotate through rooms along a short cyclic tour instead of
+    room-number order, and cross-room fallbacks try the nearest rooms first.
+    Afterwards, same-slot swaps between judges cut individual walks and whole
+    slots are reordered to shorten the waits between them. Neither step
+    changes project counts, judge loads or any slot's set of projects.
+    """
+
+    def __init__(self, system: JudgingSystem, travel: TravelModel, seed: int = None, report: RunReport = None):
+        super().__init__(system, seed, report)
+        self.travel = travel
+        self.room_tour = travel.room_tour()
+        self.tour_position = {room: position for position, room in enumerate(self.room_tour)}
+        self.travel_swaps = 0
+
+    def _phase_room(self, start_room: int, phase: int) -> int:
+        return self.room_tour[(self.tour_position[start_room] + phase) % self.system.num_rooms]
 
-    def _get_available_teams(self, room_teams: List[int], current_slot_assignments: Set[int]) -> List[int]:
+    def _fallback_rooms(self, current_room: int) -> List[int]:
+        return self.travel.rooms_by_distance(current_room)
+
+    def _create_balanced_assignments(self):
+        super()._create_balanced_assignments()
+        self.travel_swaps = self.travel.reduce_travel(self.assignments, constraints=self.system.constraints)
+        self.assignments = self.travel.order_slots(self.assignments)
+
+    def _report_counters(self):
+        super()._report_counters()
+        self.report.count('travel_swaps', self.travel_swaps)
+
+class OverlapAwareAssignmentGenerator(AssignmentGenerator):
+    """
+    AssignmentGenerator that keeps the judge co-review graph well connected,
+    so per-judge standardized scores are comparable across judges.
+    
+    The plain generator moves whole cohorts of judges through rooms in step,
+    and large events split into many small groups of judges who only ever
+    share projects with each other. Here, among the least-judged teams
+    available (all with the same number of judges so far), the generator
+    picks the one whose judges the current judge shares the fewest projects
+    with yet. Each placement then links the judge to as many new judges as
+    possible. Balance, collision and conflict rules are unchanged; teams the
+    reordering leaves short at the end are topped up with fill_missing.
+    """
+
+    def __init__(self, system: JudgingSystem, seed: int = None, report: RunReport = None):
+        super().__init__(system, seed, report)
+        self.project_judges: Dict[int, List[int]] = {team: [] for team in range(1, system.total_projects + 1)}
+        self.current_judge = None
+        self.linked_judges: Set[int] = set()
+        self.top_ups = 0
+
+    def _start_judge(self, judge_id: int):
+        self.current_judge = judge_id
+        self.linked_judges = set()
+
+    def _place_team(self, team: int):
+        super()._place_team(team)
+        judges = self.project_judges[team]
+        self.linked_judges.update(judges)
+        judges.append(self.current_judge)
+
+    def _pick_team(self, room_idx: int, current_slot_assignments: Set[int], excluded: Set[int] = frozenset(),
+                   blocked: np.ndarray = None, preferred: np.ndarray = None) -> int:
+        heap = self.room_heaps[room_idx]
+        skipped = []
+        best_score, best_team, best_count = None, -1, None
+        compared = 0
+        while heap:
+            self.candidates_scanned += 1
+            count, candidate = heap[0]
+            if count != self.project_counts[candidate] or count >= self.system.judgings_per_project:
+                heapq.heappop(heap)
+                continue
+            if (candidate in current_slot_assignments or candidate in excluded
+                    or (blocked is not None and blocked[candidate])):
+                skipped.append(heapq.heappop(heap))
+                continue
+            if best_team != -1 and (count != best_count or compared >= OVERLAP_LOOKAHEAD):
+                break
+            # Affinities first, then fewest judges already linked to this judge
+            linked = sum(1 for judge in self.project_judges[candidate] if judge in self.linked_judges)
+            score = (preferred is not None and not preferred[candidate], linked)
+            if best_score is None or score < best_score:
+                best_score, best_team, best_count = score, candidate, count
+            compared += 1
+            if score == (False, 0):
+                break
+            skipped.append(heapq.heappop(heap))
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        return best_team
+
+    def _create_balanced_assignments(self):
+        super()._create_balanced_assignments()
+        # Picking by overlap instead of table number can leave the last teams short at the end,
+        # with every judge who still has room already seeing them; top those up like a sharded merge
+        if (self.assignments.project_counts() < self.system.judgings_per_project).any():
+            # schedule_repair imports this module, so it is imported here
+            from schedule_repair import ScheduleRepairer
+            targets = np.array([self._get_target_assignments(judge_id) for judge_id in range(self.system.num_judges)])
+            placed = int(np.count_nonzero(self.assignments.filled_mask()))
+            self.assignments = ScheduleRepairer(self.system, self.assignments).fill_missing(targets=targets).matrix
+            self.top_ups = int(np.count_nonzero(self.assignments.filled_mask())) - placed
+
+    def _report_counters(self):
+        super()._report_counters()
+        self.report.count('top_ups', self.top_ups)
+
+@dataclass
+class RoomShard:
+    room: int
+    # Project ids first_project .. last_project make up the room
+    first_project: int
+    last_project: int
+    judgings_per_project: int
+    # One entry per judge visiting the room: their judgings here fill slots first_slot .. first_slot + quota - 1
+    judges: np.ndarray
+    first_slots: np.ndarray
+    quotas: np.ndarray
+    seed: int
+    # Packed conflict bits of the visiting judges (rows follow judges), from the byte holding first_project's
+    # bit through the one holding last_project's; None without conflicts
+    conflict_bits: Optional[np.ndarray] = None
+
+@dataclass
+class ShardResult:
+    room: int
+    # One entry per placement: judge, slot and project id
+    judges: np.ndarray
+    slots: np.ndarray
+    projects: np.ndarray
+    candidates_scanned: int
+
+def generate_room_shard(shard: RoomShard) -> ShardResult:
+    """
+    Sub-schedule for one room. Slot by slot, every judge due in the room
+    takes the least-judged team that is free in that slot and that they have
+    not judged yet, as _pick_team does; judges sharing a slot go in a seeded
+    random order. Rooms share no projects, so shards never collide.
+    """
+    rng = random.Random(shard.seed)
+    first = shard.first_project
+    counts = [0] * (shard.last_project - first + 1)
+    # Already a valid heap: every count is 0 and teams are in order
+    heap = [(0, team) for team in range(len(counts))]
+    cells = [(slot, rng.random(), i) for i, (start, quota) in enumerate(zip(shard.first_slots.tolist(), shard.quotas.tolist()))
+             for slot in range(start, start + quota)]
+    cells.sort()
+    conflicts = None
+    if shard.conflict_bits is not None:
+        # Unpacked in the worker, so only the packed bytes are sent to it
+        shift = first & 7
+        conflicts = np.unpackbits(shard.conflict_bits, axis=1, bitorder='little')[:, shift:shift + len(counts)].astype(bool)
+    seen = [set() for _ in range(len(shard.judges))]
+    taken: Dict[int, Set[int]] = {}
+    placed_judges, placed_slots, placed_projects = [], [], []
+    scanned = 0
+    for slot, _, i in cells:
+        judge = int(shard.judges[i])
+        slot_teams = taken.setdefault(slot, set())
+        blocked = conflicts[i] if conflicts is not None else None
+        skipped = []
+        team = -1
+        while heap:
+            scanned += 1
+            count, candidate = heap[0]
+            if count != counts[candidate] or count >= shard.judgings_per_project:
+                heapq.heappop(heap)
+                continue
+            if candidate in slot_teams or candidate in seen[i] or (blocked is not None and blocked[candidate]):
+                skipped.append(heapq.heappop(heap))
+                continue
+            team = heapq.heappop(heap)[1]
+            break
+        for entry in skipped:
+            heapq.heappush(heap, entry)
+        if team == -1:
+            # Left for the merge to place from another room
+            continue
+        counts[team] += 1
+        if counts[team] < shard.judgings_per_project:
+            heapq.heappush(heap, (counts[team], team))
+        slot_teams.add(team)
+        seen[i].add(team)
+        placed_judges.append(judge)
+        placed_slots.append(slot)
+        placed_projects.append(first + team)
+    return ShardResult(shard.room, np.array(placed_judges, dtype=np.int64), np.array(placed_slots, dtype=np.int64),
+                       np.array(placed_projects, dtype=np.int32), scanned)
+
+class ShardedAssignmentGenerator(AssignmentGenerator):
+    """
+    AssignmentGenerator for very large events that splits the work by room.
+    
+    Rooms share no projects, so once every judge's number of judgings in
+    each room is fixed, rooms can be scheduled independently. A global plan
+    keeps the usual cohorts (judges starting in the same room move through
+    the rooms together, one phase per room) and evens the judgings each room
+    receives out against what its teams need. Each room's sub-schedule is
+    then built in its own worker process. A final merge places judgings no
+    room could fill, e.g. for conflicts, in free cells of judges still under
+    their target, and checks that no project appears twice in any slot.
+    
+    Affinities are not used: they would need the shards to share state.
+    """
+
+    def __init__(self, system: JudgingSystem, seed: int = None, report: RunReport = None, max_workers: int = None):
+        super().__init__(system, seed, report)
+        self.max_workers = max_workers
+        self.slot_collisions = 0
+
+    def _targets(self) -> np.ndarray:
+        return np.array([self._get_target_assignments(judge_id) for judge_id in range(self.system.num_judges)], dtype=np.int64)
+
+    def plan_quotas(self) -> np.ndarray:
         """
-        Returns a list of teams that are available to be judged in the current slot.
-        A team is available if:
-        1. It's in the current room's team list
-        2. It's not already being judged in this time slot
-        3. It hasn't reached its maximum number of judgings
+        judges x rooms count of judgings each judge does in each room. Starts
+        from the phase layout the serial generator uses, then moves judgings
+        between a judge's rooms wherever one room is over-supplied and
+        another is short, within the teams_per_phase slots of a phase.
         """
-        available = []
-        for team in room_teams:
-            if (team not in current_slot_assignments and 
-                self.project_counts.get(team, 0) < self.system.judgings_per_project):
-                available.append(team)
-        return available
-
-    def _create_assignment_dataframe(self) -> pd.DataFrame:
-        df = pd.DataFrame(self.assignments)
-        df.index.name = 'Judge'
+        num_rooms = self.system.num_rooms
+        sizes = np.diff(self.system.rooms.offsets)
+        caps = np.minimum(self.teams_per_phase, sizes)
+        starts = np.array(self.initial_room_assignments, dtype=np.int64)
+        judges = np.arange(self.system.num_judges)
+        quotas = np.zeros((self.system.num_judges, num_rooms), dtype=np.int64)
+        remaining = self._targets()
+        for phase in range(num_rooms):
+            rooms = (starts + phase) % num_rooms
+            take = np.minimum(caps[rooms], remaining)
+            quotas[judges, rooms] = take
+            remaining -= take
+        
+        # Judgings each room receives minus what its teams need
+        surplus = quotas.sum(axis=0) - sizes * self.system.judgings_per_project
+        for over in np.flatnonzero(surplus > 0).tolist():
+            for under in np.flatnonzero(surplus < 0).tolist():
+                amount = min(surplus[over], -surplus[under])
+                if amount <= 0:
+                    continue
+                movable = np.minimum(quotas[:, over], caps[under] - quotas[:, under]).clip(min=0)
+                # Take from the first judges that can move, up to the amount needed
+                moved = np.minimum(movable, np.maximum(amount - (np.cumsum(movable) - movable), 0))
+                quotas[:, over] -= moved
+                quotas[:, under] += moved
+                surplus[over] -= moved.sum()
+                surplus[under] += moved.sum()
+        return quotas
+
+    def _room_conflicts(self, judges: np.ndarray, first: int, last: int) -> Optional[np.ndarray]:
+        # The visiting judges' packed bytes covering the room's project ids
+        constraints = self.system.constraints
+        if constraints is None or not constraints.conflict_bits.any():
+            return None
+        return constraints.conflict_bits[judges, first >> 3:(last >> 3) + 1]
+
+    def build_shards(self, quotas: np.ndarray) -> List[RoomShard]:
+        num_rooms = self.system.num_rooms
+        starts = np.array(self.initial_room_assignments, dtype=np.int64)
+        judges = np.arange(self.system.num_judges)
+        # Each judge's rooms get consecutive runs of slots, in phase order
+        first_slots = np.zeros_like(quotas)
+        next_slot = np.zeros(self.system.num_judges, dtype=np.int64)
+        for phase in range(num_rooms):
+            rooms = (starts + phase) % num_rooms
+            first_slots[judges, rooms] = next_slot
+            next_slot += quotas[judges, rooms]
         
-        # Format DataFrame
-        df = df.fillna(-1)
-        df = df.astype(int)
-        max_teams = df.apply(lambda x: x[x != -1].count(), axis=1).max()
-        df.columns = [f'Slot {i+1}' for i in range(max_teams)]
+        offsets = self.system.rooms.offsets
+        shards = []
+        for room in range(num_rooms):
+            first, last = int(offsets[room]) + 1, int(offsets[room + 1])
+            if first > last:
+                continue
+            visiting = np.flatnonzero(quotas[:, room] > 0)
+            shards.append(RoomShard(room, first, last, self.system.judgings_per_project, visiting,
+                                    first_slots[visiting, room], quotas[visiting, room],
+                                    self.rng.getrandbits(32), self._room_conflicts(visiting, first, last)))
+        return shards
+
+    def _create_balanced_assignments(self):
+        with self.report.span('plan_shards'):
+            shards = self.build_shards(self.plan_quotas())
         
-        # Replace numbers with team names and table numbers
-        for i in range(max_teams):
-            df[f'Slot {i+1}'] = df[f'Slot {i+1}'].apply(
-                lambda x: f'{self.system.projects[x-1].name} (Table {self.system.projects[x-1].table_number})' 
-                if x != -1 else 'No team for this time slot'
+        with self.report.span('generate_shards', shards=len(shards)):
+            if len(shards) <= 1 or self.max_workers == 1:
+                results = [generate_room_shard(shard) for shard in shards]
+            else:
+                with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                    results = list(executor.map(generate_room_shard, shards))
+        
+        with self.report.span('merge_shards'):
+            data = self.assignments.data
+            for result in results:
+                data[result.judges, result.slots] = result.projects
+                self.candidates_scanned += result.candidates_scanned
+            placed = int(np.count_nonzero(data != EMPTY))
+            
+            # Judgings no room could fill go to judges still short of their target, in any room
+            # (schedule_repair imports this module, so it is imported here)
+            from schedule_repair import ScheduleRepairer
+            merged = ScheduleRepairer(self.system, self.assignments).fill_missing(targets=self._targets())
+            matrix = merged.matrix
+            self.cross_room_fallbacks = int(np.count_nonzero(matrix.data != EMPTY)) - placed
+            
+            self.assignments = matrix.trimmed(int(np.flatnonzero((matrix.data != EMPTY).any(axis=0)).max(initial=-1)) + 1)
+            self.slot_collisions = len(self.assignments.slot_duplicates())
+
+    def _report_counters(self):
+        super()._report_counters()
+        self.report.count('slot_collisions', self.slot_collisions)
+
+class InfeasibleScheduleError(ValueError):
+    pass
+
+class ExactAssignmentGenerator(AssignmentGenerator):
+    """
+    Builds a valid schedule in a single pass, without randomness or retries.
+    
+    Judgings form a bipartite judge-project graph in which every project has
+    degree judgings_per_project and every judge has degree base_per_judge or
+    base_per_judge + 1. Coloring its edges with time slots so no judge or
+    project repeats within a slot needs exactly max degree colors (Konig),
+    which is also the lower bound on the slot count.
+    """
+
+    def __init__(self, system: JudgingSystem, seed: int = None, report: RunReport = None):
+        # The edge coloring cannot steer judges away from projects, so conflicts would be silently broken
+        if system.constraints is not None and system.constraints.conflict_bits.any():
+            raise ValueError("ExactAssignmentGenerator does not support judge conflicts; use AssignmentGenerator")
+        self._check_feasible(system)
+        super().__init__(system, seed, report)
+        self.num_slots = self.lower_bound_slots(system)
+        self.path_swaps = 0
+
+    @staticmethod
+    def lower_bound_slots(system: JudgingSystem) -> int:
+        if system.total_projects == 0:
+            return 0
+        max_judge_load = math.ceil(system.total_projects * system.judgings_per_project / system.num_judges)
+        return max(max_judge_load, system.judgings_per_project)
+
+    @staticmethod
+    def _check_feasible(system: JudgingSystem):
+        # Without judges there is no schedule to build, even an empty one
+        if system.num_judges == 0:
+            raise InfeasibleScheduleError(f"There are no judges for the {system.total_projects} projects")
+        if system.total_projects == 0:
+            return
+        if system.judgings_per_project > system.num_judges:
+            raise InfeasibleScheduleError(
+                f"Each project needs {system.judgings_per_project} different judges but only {system.num_judges} are available"
             )
+
+    def _judge_projects(self) -> List[List[int]]:
+        # Deal judgings out as contiguous runs over tables 1..P repeated judgings_per_project times.
+        # Runs are at most P long, so no judge sees a project twice, and neighbouring
+        # tables keep each judge within as few rooms as possible.
+        total = self.system.total_projects
+        judge_projects = []
+        position = 0
+        for judge_id in range(self.system.num_judges):
+            load = self._get_target_assignments(judge_id)
+            judge_projects.append([(position + i) % total + 1 for i in range(load)])
+            position += load
+        return judge_projects
+
+    def _create_balanced_assignments(self):
+        num_slots = self.num_slots
+        # judge_slots[j][c] / project_slots[p][c] hold the partner seen in slot c, or -1
+        judge_slots = [[EMPTY] * num_slots for _ in range(self.system.num_judges)]
+        project_slots = [[EMPTY] * num_slots for _ in range(self.system.total_projects + 1)]
         
-        # Add judge information
-        df.insert(0, 'Judge ID', range(1001, 1001 + len(df)))
-        df.index = df.index.map(lambda x: f'{self.system.judges[x].first_name} {self.system.judges[x].last_name}')
+        for judge_id, projects in enumerate(self._judge_projects()):
+            judge_row = judge_slots[judge_id]
+            for team in projects:
+                project_row = project_slots[team]
+                free_judge = judge_row.index(EMPTY)
+                if project_row[free_judge] != EMPTY:
+                    free_project = project_row.index(EMPTY)
+                    if judge_row[free_project] == EMPTY:
+                        free_judge = free_project
+                    else:
+                        self._swap_alternating_path(judge_slots, project_slots, team, free_judge, free_project)
+                        self.path_swaps += 1
+                judge_row[free_judge] = team
+                project_row[free_judge] = judge_id
+                self.project_counts[team] += 1
+                self.judge_counts[judge_id] += 1
         
-        return df
+        self.assignments = AssignmentMatrix(
+            np.array(judge_slots, dtype=np.int32).reshape(self.system.num_judges, num_slots),
+            self.system.total_projects
+        )
+
+    def _report_counters(self):
+        super()._report_counters()
+        self.report.count('alternating_path_swaps', self.path_swaps)
 
-    def generate_assignments(self) -> pd.DataFrame:
-        self._create_balanced_assignments()
-        return self._create_assignment_dataframe()
+    @staticmethod
+    def _swap_alternating_path(judge_slots: List[List[int]], project_slots: List[List[int]], team: int, color_a: int, color_b: int):
+        """
+        Frees color_a at team by swapping colors a and b along the alternating
+        path that starts at team with an a-edge. The path can never reach the
+        judge being placed, since that judge has color_a free.
+        """
+        path = []
+        project = team
+        while True:
+            judge = project_slots[project][color_a]
+            if judge == EMPTY:
+                break
+            path.append((judge, project, color_a))
+            project = judge_slots[judge][color_b]
+            if project == EMPTY:
+                break
+            path.append((judge, project, color_b))
+        for judge, project, color in path:
+            judge_slots[judge][color] = EMPTY
+            project_slots[project][color] = EMPTY
+        for judge, project, color in path:
+            swapped = color_b if color == color_a else color_a
+            judge_slots[judge][swapped] = project
+            project_slots[project][swapped] = judge
 
 class AssignmentVerifier:
-    def __init__(self, df: pd.DataFrame, system: JudgingSystem):
+    JUDGING_COUNT = 'judging_count'
+    SIMULTANEOUS_JUDGING = 'simultaneous_judging'
+    JUDGE_WORKLOAD = 'judge_workload'
+    JUDGE_CONFLICT = 'judge_conflict'
+    MAX_WORKLOAD_DEVIATION = 2
+
+    def __init__(self, df: 'Optional[pd.DataFrame]', system: JudgingSystem, matrix: AssignmentMatrix = None, report: RunReport = None):
         self.df = df
         self.system = system
+        self.report = report if report is not None else system.report
+        # All checks run on the integer schedule; df is only parsed when no matrix is given
+        if matrix is None:
+            with self.report.span('parse_assignment_dataframe'):
+                matrix = self._matrix_from_dataframe(df)
+        self.matrix = matrix
+        self.table_numbers = system.projects.table_numbers
     
-    def _verify_judging_count(self) -> List[str]:
-        project_counts = {}
-        for col in self.df.columns:
-            if col.startswith('Slot'):
-                for cell in self.df[col]:
-                    if cell != 'No team for this time slot':
-                        table_num = int(cell.split('Table ')[-1].strip(')'))
-                        project_counts[table_num] = project_counts.get(table_num, 0) + 1
+    def _matrix_from_dataframe(self, df: 'pd.DataFrame') -> AssignmentMatrix:
+        import pandas as pd
+        slot_columns = [col for col in df.columns if col.startswith('Slot')]
+        cells = pd.Series(df[slot_columns].to_numpy(dtype=object).ravel()).astype(str)
         
-        issues = []
-        for i in range(1, self.system.total_projects + 1):
-            count = project_counts.get(i, 0)
-            if count != self.system.judgings_per_project:
-                issues.append(f"Project {i} is judged {count} times (should be {self.system.judgings_per_project})")
+        # Map display labels straight back to project ids, falling back to the table number
+        label_ids = {label: project_id for project_id, label in enumerate(self.system.projects.labels(), start=1)}
+        table_ids = {table: project_id for project_id, table in enumerate(self.system.projects.table_numbers.tolist(), start=1)}
+        project_ids = cells.map(label_ids)
+        unknown = project_ids.isna() & (cells != 'No team for this time slot')
+        if unknown.any():
+            tables = cells[unknown].str.extract(r'Table (\d+)\)\s*$', expand=False).astype(float)
+            project_ids[unknown] = tables.map(table_ids)
         
+        data = project_ids.fillna(EMPTY).to_numpy(dtype=np.int32).reshape(len(df), len(slot_columns))
+        return AssignmentMatrix(data, self.system.total_projects)
+    
+    def _judge_label(self, judge: int):
+        if self.df is not None:
+            return self.df.index[judge]
+        return f'{self.system.judges[judge].first_name} {self.system.judges[judge].last_name}'
+    
+    def _judging_count_issues(self, fail_fast: bool = False) -> List[VerificationIssue]:
+        counts = self.matrix.project_counts()
+        issues = []
+        for project_idx in np.flatnonzero(counts != self.system.judgings_per_project).tolist():
+            issues.append(VerificationIssue(
+                self.JUDGING_COUNT, table=int(self.table_numbers[project_idx]), count=int(counts[project_idx])
+            ))
+            if fail_fast:
+                break
         return issues
     
-    def _verify_simultaneous_judging(self) -> List[str]:
+    def _simultaneous_judging_issues(self, fail_fast: bool = False) -> List[VerificationIssue]:
+        # One issue per extra judge on a project within a slot
+        slots, judges = self.matrix.repeated_cells()
         issues = []
-        for col in self.df.columns:
-            if col.startswith('Slot'):
-                slot_projects = self.df[col].tolist()
-                table_numbers = []
-                for proj in slot_projects:
-                    if proj != 'No team for this time slot':
-                        table_num = int(proj.split('Table ')[-1].strip(')'))
-                        table_numbers.append(table_num)
-                seen = set()
-                duplicates = set()
-                for num in table_numbers:
-                    if num in seen:
-                        duplicates.add(num)
-                    seen.add(num)
-                if duplicates:
-                    issues.append(f"In {col}, projects at tables {duplicates} are being judged simultaneously")
+        for slot, judge in zip(slots.tolist(), judges.tolist()):
+            project_id = int(self.matrix.data[judge, slot])
+            issues.append(VerificationIssue(
+                self.SIMULTANEOUS_JUDGING, slot=slot, table=int(self.table_numbers[project_id - 1]), judge=judge
+            ))
+            if fail_fast:
+                break
         return issues
     
-    def _verify_judge_workload(self) -> List[str]:
-        # Exclude 'Judge ID' column
-        assignment_columns = [col for col in self.df.columns if col.startswith('Slot')]
-        # Calculate the count of assignments for each judge
-        judge_counts = self.df[assignment_columns].apply(
-            lambda row: row[row != 'No team for this time slot'].count(), axis=1
-        ).to_dict()
-
-        avg_load = sum(judge_counts.values()) / len(judge_counts)
-        max_deviation = 2
-
+    def _judge_workload_issues(self, fail_fast: bool = False) -> List[VerificationIssue]:
+        loads = self.matrix.judge_loads()
+        if len(loads) == 0:
+            return []
+        avg_load = loads.mean()
         issues = []
-        for judge, count in judge_counts.items():
-            if abs(count - avg_load) > max_deviation:
-                issues.append(f"Judge {judge} has {count} projects (average is {avg_load:.1f})")
-
+        for judge in np.flatnonzero(np.abs(loads - avg_load) > self.MAX_WORKLOAD_DEVIATION).tolist():
+            issues.append(VerificationIssue(self.JUDGE_WORKLOAD, judge=judge, count=int(loads[judge])))
+            if fail_fast:
+                break
+        return issues
+    
+    def _judge_conflict_issues(self, fail_fast: bool = False) -> List[VerificationIssue]:
+        if self.system.constraints is None:
+            return []
+        issues = []
+        judges, slots = self.system.constraints.conflicted_cells(self.matrix)
+        for judge, slot in zip(judges.tolist(), slots.tolist()):
+            project_id = int(self.matrix.data[judge, slot])
+            issues.append(VerificationIssue(
+                self.JUDGE_CONFLICT, slot=slot, table=int(self.table_numbers[project_id - 1]), judge=judge
+            ))
+            if fail_fast:
+                break
         return issues
     
+    def find_issues(self, fail_fast: bool = False) -> List[VerificationIssue]:
+        """
+        Runs every check on the integer schedule and returns structured issues.
+        With fail_fast, stops at the first violation found.
+        """
+        issues = []
+        with self.report.span('verify', fail_fast=fail_fast):
+            for check in (self._judging_count_issues, self._simultaneous_judging_issues, self._judge_workload_issues,
+                          self._judge_conflict_issues):
+                issues.extend(check(fail_fast))
+                if fail_fast and issues:
+                    break
+        self.report.count('verification_issues', len(issues))
+        return issues
+    
+    def is_valid(self) -> bool:
+        return not self.find_issues(fail_fast=True)
+    
+    def _verify_judging_count(self) -> List[str]:
+        return [
+            f"Project {issue.table} is judged {issue.count} times (should be {self.system.judgings_per_project})"
+            for issue in self._judging_count_issues()
+        ]
+    
+    def _verify_simultaneous_judging(self) -> List[str]:
+        tables_by_slot: Dict[int, Set[int]] = {}
+        for issue in self._simultaneous_judging_issues():
+            tables_by_slot.setdefault(issue.slot, set()).add(issue.table)
+        return [
+            f"In Slot {slot + 1}, projects at tables {tables} are being judged simultaneously"
+            for slot, tables in tables_by_slot.items()
+        ]
+    
+    def _verify_judge_workload(self) -> List[str]:
+        avg_load = self.matrix.judge_loads().mean() if self.matrix.num_judges else 0.0
+        return [
+            f"Judge {self._judge_label(issue.judge)} has {issue.count} projects (average is {avg_load:.1f})"
+            for issue in self._judge_workload_issues()
+        ]
+    
+    def _verify_judge_conflicts(self) -> List[str]:
+        return [
+            f"Judge {self._judge_label(issue.judge)} is scheduled to judge conflicting project {issue.table} in Slot {issue.slot + 1}"
+            for issue in self._judge_conflict_issues()
+        ]
+    
     def verify_all(self) -> Tuple[bool, List[str]]:
         issues = []
-        issues.extend(self._verify_judging_count())
-        issues.extend(self._verify_simultaneous_judging())
-        issues.extend(self._verify_judge_workload())
+        with self.report.span('verify', fail_fast=False):
+            issues.extend(self._verify_judging_count())
+            issues.extend(self._verify_simultaneous_judging())
+            issues.extend(self._verify_judge_workload())
+            issues.extend(self._verify_judge_conflicts())
+        self.report.count('verification_issues', len(issues))
         return len(issues) == 0, issues
 
-def main():
-    # Get input parameters
-    demo_mode = input("Run in demo mode? (y/n): ").lower() == 'y'
-    judgins_per_project = int(input("Enter number of judgings per project: "))
-    num_rooms = int(input("Enter number of rooms: "))
-    num_judges = int(input("Enter number of judges: ")) if demo_mode else None
-    total_projects = int(input("Enter total number of projects: ")) if demo_mode else None
+@dataclass
+class AttemptResult:
+    seed: int
+    valid: bool
+    idle_slots: int
+    workload_spread: int
+    matrix: AssignmentMatrix
+
+    def score(self) -> Tuple[bool, int, int]:
+        # Lower is better: valid schedules first, then fewest idle slots, then most even workloads
+        return (not self.valid, self.idle_slots, self.workload_spread)
+
+def run_seeded_attempt(system: JudgingSystem, seed: int) -> AttemptResult:
+    generator = AssignmentGenerator(system, seed=seed)
+    generator._create_balanced_assignments()
+    matrix = generator.assignments
+    loads = matrix.judge_loads()
+    return AttemptResult(
+        seed=seed,
+        valid=AssignmentVerifier(None, system, matrix).is_valid(),
+        idle_slots=matrix.idle_cells(),
+        workload_spread=int(loads.max() - loads.min()) if len(loads) else 0,
+        matrix=matrix
+    )
+
+def generate_multi_seed(system: JudgingSystem, seeds: List[int], max_workers: int = None, best_of: bool = False) -> Optional[AttemptResult]:
+    """
+    Runs one AssignmentGenerator attempt per seed across a process pool.
+    By default returns the first verified schedule and cancels the rest;
+    with best_of, scores every attempt and returns the best one. Returns None
+    if no attempt produced a valid schedule and best_of is not set.
+    """
+    results = []
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        pending = {executor.submit(run_seeded_attempt, system, seed) for seed in seeds}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            results.extend(future.result() for future in done)
+            if not best_of and any(result.valid for result in results):
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
     
-    # Initialize system
-    system = JudgingSystem(num_rooms=num_rooms, judgings_per_project=judgins_per_project, demo_mode=demo_mode, num_judges=num_judges, total_projects=total_projects)
+    if not results:
+        return None
+    # Break ties on seed so best_of picks the same winner on every run
+    best = min(results, key=lambda result: (result.score(), result.seed))
+    return best if best.valid or best_of else None
+
+@dataclass
+class Scenario:
+    num_judges: int
+    total_projects: int
+    num_rooms: int
+    judgings_per_project: int
+    seed: int = 0
+    exact: bool = False
+    max_attempts: int = 10
+
+def load_scenarios(path: str) -> List[Scenario]:
+    """
+    Reads a batch config CSV with columns judges, projects, rooms,
+    judgings_per_project and optionally seed, exact and max_attempts.
+    Blank optional cells take their defaults; a blank or non-integer
+    required cell raises ValueError naming the CSV line.
+    """
+    import pandas as pd
+    df = pd.read_csv(path)
+    scenarios = []
+    # Line 1 is the header
+    for line, row in enumerate(df.to_dict('records'), start=2):
+        def integer(column: str, default: Optional[int] = None) -> int:
+            value = row.get(column)
+            if pd.isna(value):
+                if default is None:
+                    raise ValueError(f"{path} line {line}: '{column}' is blank")
+                return default
+            try:
+                return int(value)
+            except ValueError:
+                raise ValueError(f"{path} line {line}: '{column}' is not an integer: {value!r}") from None
+        
+        exact = row.get('exact')
+        scenarios.append(Scenario(
+            num_judges=integer('judges'),
+            total_projects=integer('projects'),
+            num_rooms=integer('rooms'),
+            judgings_per_project=integer('judgings_per_project'),
+            seed=integer('seed', 0),
+            exact=not pd.isna(exact) and str(exact).lower() in ('1', '1.0', 'true', 'y', 'yes'),
+            max_attempts=integer('max_attempts', 10)
+        ))
+    return scenarios
+
+def run_scenario(scenario: Scenario) -> Dict:
+    start = time.perf_counter()
+    # Demo rosters are drawn from the scenario seed so every run of a config is reproducible
+    random.seed(scenario.seed)
+    system = JudgingSystem(
+        num_rooms=scenario.num_rooms, judgings_per_project=scenario.judgings_per_project, demo_mode=True,
+        num_judges=scenario.num_judges, total_projects=scenario.total_projects
+    )
+    
+    attempts = 0
+    result = None
+    error = ''
+    if scenario.exact:
+        try:
+            generator = ExactAssignmentGenerator(system, seed=scenario.seed)
+            generator._create_balanced_assignments()
+            matrix = generator.assignments
+            attempts = 1
+            result = AttemptResult(scenario.seed, AssignmentVerifier(None, system, matrix).is_valid(),
+                                   matrix.idle_cells(), 0, matrix)
+        except InfeasibleScheduleError as e:
+            error = str(e)
+    else:
+        while attempts < scenario.max_attempts and (result is None or not result.valid):
+            result = run_seeded_attempt(system, scenario.seed + attempts)
+            attempts += 1
+    
+    return {
+        'judges': scenario.num_judges,
+        'projects': scenario.total_projects,
+        'rooms': scenario.num_rooms,
+        'judgings_per_project': scenario.judgings_per_project,
+        'seed': scenario.seed,
+        'engine': 'exact' if scenario.exact else 'greedy',
+        'attempts': attempts,
+        'winning_seed': result.seed if result is not None and result.valid else None,
+        'runtime_s': round(time.perf_counter() - start, 4),
+        'slots': result.matrix.num_slots if result is not None else 0,
+        'idle_slots': result.idle_slots if result is not None else 0,
+        'verified': result is not None and result.valid,
+        'error': error
+    }
+
+def run_batch(scenarios: List[Scenario], max_workers: int = None) -> 'pd.DataFrame':
+    import pandas as pd
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        rows = list(executor.map(run_scenario, scenarios))
+    return pd.DataFrame(rows).astype({'winning_seed': 'Int64'})
+
+def run_schedule(system: JudgingSystem, exact_mode: bool = False, parallel_attempts: int = 1, best_of: bool = False,
+                 max_attempts: int = 10, output_path: str = 'assignments.csv', base_seed: int = 0, max_workers: int = None,
+                 report: RunReport = None, output_format: str = 'csv', judge_sheets_dir: str = None,
+                 travel: TravelModel = None, optimize_seconds: float = None, template_cache: TemplateCache = None,
+                 overlap_aware: bool = False, show_graph_metrics: bool = False, sharded: bool = False) -> bool:
+    report = report if report is not None else system.report
+    # The exact scheduler either succeeds on its first pass or proves no schedule exists
+    generator_class = AssignmentGenerator
+    if exact_mode:
+        try:
+            ExactAssignmentGenerator._check_feasible(system)
+        except InfeasibleScheduleError as e:
+            print(f"No valid assignments exist: {e}")
+            return False
+        generator_class = ExactAssignmentGenerator
+        max_attempts = 1
+    elif overlap_aware:
+        generator_class = OverlapAwareAssignmentGenerator
+    
+    success = False
+    
+    # A verified template for the same event shape and settings skips generation and verification;
+    # travel and constraints depend on more than the shape, so those runs are never cached
+    template_key = None
+    from_template = False
+    if template_cache is not None and travel is None and system.constraints is None:
+        engine = 'overlap' if overlap_aware else 'sharded' if sharded else 'greedy'
+        variant = 'exact' if exact_mode else f"{engine}-p{parallel_attempts}{'-best' if best_of else ''}"
+        if optimize_seconds:
+            variant += f'-opt{optimize_seconds:g}'
+        template_key = TemplateKey(system.num_judges, system.total_projects, system.num_rooms,
+                                   system.judgings_per_project, base_seed, variant)
+        with report.span('template_lookup'):
+            cached = template_cache.get(template_key)
+        if cached is not None:
+            matrix = cached
+            success = from_template = True
+            max_attempts = 0
+            report.count('template_hits')
+            print(f"Reusing cached schedule template {template_key.filename()}")
+    
+    # Seeds are explicit, so the winning schedule can be regenerated with AssignmentGenerator(system, seed)
+    if parallel_attempts > 1 and not exact_mode and not success:
+        seeds = list(range(base_seed, base_seed + parallel_attempts))
+        with report.span('multi_seed_generation', attempts=parallel_attempts):
+            result = generate_multi_seed(system, seeds, max_workers=max_workers, best_of=best_of)
+        success = result is not None and result.valid
+        if success:
+            matrix = result.matrix
+            print(f"Seed {result.seed} produced a verified schedule "
+                  f"({result.idle_slots} idle slots, workload spread {result.workload_spread})")
+        max_attempts = 0
     
     # Generate and verify assignments with retries
-    max_attempts = 10
     attempt = 1
-    success = False
     
     while attempt <= max_attempts and not success:
         print(f"\nAttempt {attempt} of {max_attempts}")
+        report.count('attempts')
         
-        generator = AssignmentGenerator(system)
-        df = generator.generate_assignments()
-        
-        verifier = AssignmentVerifier(df, system)
-        success, issues = verifier.verify_all()
+        with report.span('attempt', attempt=attempt):
+            if travel is not None:
+                generator = TravelAwareAssignmentGenerator(system, travel, report=report)
+            elif sharded:
+                generator = ShardedAssignmentGenerator(system, report=report, max_workers=max_workers)
+            else:
+                generator = generator_class(system, report=report)
+            matrix = generator.generate_matrix()
+            
+            verifier = AssignmentVerifier(None, system, matrix, report=report)
+            success, issues = verifier.verify_all()
         
         if success:
             print("All verifications passed successfully!")
@@ -331,13 +1149,149 @@ def main():
         
         attempt += 1
     
+    if success and optimize_seconds and not from_template:
+        with report.span('optimize', time_budget=optimize_seconds):
+            optimized = LocalSearchOptimizer(matrix, seed=base_seed, time_budget=optimize_seconds,
+                                             max_deviation=AssignmentVerifier.MAX_WORKLOAD_DEVIATION,
+                                             constraints=system.constraints).optimize()
+        report.count('optimizer_moves', optimized.moves)
+        # The optimizer preserves every check by construction; verify anyway before replacing the schedule
+        if AssignmentVerifier(None, system, optimized.matrix, report=report).is_valid():
+            matrix = optimized.matrix
+            print(f"Optimized: {optimized.before.slots} -> {optimized.after.slots} slots, "
+                  f"{optimized.before.idle_cells} -> {optimized.after.idle_cells} idle cells, "
+                  f"load spread {optimized.before.load_spread} -> {optimized.after.load_spread}")
+    
+    if success and template_key is not None and not from_template:
+        template_cache.put(template_key, matrix)
+    
     # Save final assignments
     if success:
-        # Save final assignments
-        df.to_csv('assignments.csv')
-        print("Saved assignments to 'assignments.csv'")
+        if travel is not None:
+            print(travel.timing(matrix).summary())
+        if show_graph_metrics:
+            with report.span('graph_metrics'):
+                print(graph_metrics(matrix).summary())
+        exporter = AssignmentExporter(system, matrix)
+        with report.span('export', format=output_format):
+            exporter.write(output_path, output_format)
+        print(f"Saved assignments to '{output_path}'")
+        if judge_sheets_dir:
+            with report.span('export_judge_sheets'):
+                exporter.write_judge_files(judge_sheets_dir, max_workers=max_workers)
+            print(f"Saved judge sheets to '{judge_sheets_dir}'")
     else:
         print("No valid assignments could be generated.")
+    return success
+
+def prompt_for_args(args: argparse.Namespace):
+    args.demo = input("Run in demo mode? (y/n): ").lower() == 'y'
+    args.judgings_per_project = int(input("Enter number of judgings per project: "))
+    args.rooms = int(input("Enter number of rooms: "))
+    args.judges = int(input("Enter number of judges: ")) if args.demo else None
+    args.projects = int(input("Enter total number of projects: ")) if args.demo else None
+    args.exact = input("Use exact scheduler? (y/n): ").lower() == 'y'
+    args.parallel = 1 if args.exact else int(input("Enter number of parallel seeded attempts (1 to run sequentially): "))
+    args.best_of = args.parallel > 1 and input("Keep the best of all attempts? (y/n): ").lower() == 'y'
+
+def parse_args(argv: List[str] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate balanced judging assignments.")
+    parser.add_argument('--demo', action='store_true', help="generate random judges and projects instead of reading CSVs")
+    parser.add_argument('--judges', type=int, help="number of judges (demo mode)")
+    parser.add_argument('--projects', type=int, help="total number of projects (demo mode)")
+    parser.add_argument('--rooms', type=int, help="number of rooms")
+    parser.add_argument('--judgings-per-project', type=int, help="number of judgings per project")
+    parser.add_argument('--judges-csv', default='judges.csv', help="judge roster (default: judges.csv)")
+    parser.add_argument('--teams-csv', default='team.csv', help="team roster (default: team.csv)")
+    parser.add_argument('--constraints', help="CSV of judgeId, tableNumber, constraint ('conflict' or 'affinity') pairs")
+    parser.add_argument('--roster-cache', help="directory for cached parsed rosters, shared across runs")
+    parser.add_argument('--template-cache', help="directory of verified schedule templates reused for repeat event shapes")
+    parser.add_argument('--output', default='assignments.csv', help="assignment file to write (default: assignments.csv)")
+    parser.add_argument('--format', choices=['csv', 'long', 'binary'], default='csv',
+                        help="csv: one row per judge; long: one (judge, slot, table) row per judging; binary: compact int32 matrix")
+    parser.add_argument('--judge-sheets', help="directory to write one CSV sheet per judge into")
+    parser.add_argument('--exact', action='store_true', help="use the exact single-pass scheduler")
+    parser.add_argument('--overlap-aware', action='store_true',
+                        help="pick teams that link each judge to judges they share no project with yet")
+    parser.add_argument('--sharded', action='store_true',
+                        help="build each room's sub-schedule in its own worker process, for very large events")
+    parser.add_argument('--graph-metrics', action='store_true',
+                        help="print components and spectral gap of the judge co-review graph")
+    parser.add_argument('--parallel', type=int, default=1, help="number of seeded attempts to run in parallel")
+    parser.add_argument('--best-of', action='store_true', help="keep the best of all parallel attempts")
+    parser.add_argument('--travel-matrix', help="CSV of walking minutes between rooms (or tables); enables travel-aware scheduling")
+    parser.add_argument('--slot-minutes', type=float, default=DEFAULT_SLOT_MINUTES,
+                        help=f"length of one judging slot in minutes, for travel-aware scheduling (default: {DEFAULT_SLOT_MINUTES:g})")
+    parser.add_argument('--optimize', type=float, metavar='SECONDS',
+                        help="spend up to this long on local search to cut slots, idle cells and load spread")
+    parser.add_argument('--max-attempts', type=int, default=10, help="sequential retries for the randomized generator")
+    parser.add_argument('--seed', type=int, help="seed the random state for reproducible demo rosters and schedules")
+    parser.add_argument('--batch', help="CSV of scenarios (judges, projects, rooms, judgings_per_project, seed) to run")
+    parser.add_argument('--workers', type=int, help="worker processes for batch and parallel runs")
+    parser.add_argument('--summary', help="CSV to write the batch summary table to")
+    parser.add_argument('--report', help="JSON file to write per-stage timings and counters to")
+    parser.add_argument('--report-memory', action='store_true', help="also record tracemalloc allocation peaks per stage")
+    args = parser.parse_args(argv)
+    
+    # Prompt only for a bare run; any scenario flag means a scripted run, which must not block on input
+    defaults = vars(parser.parse_args([]))
+    scenario_flags = [name for name, value in vars(args).items() if name not in ('output', 'seed') and value != defaults[name]]
+    if not scenario_flags:
+        prompt_for_args(args)
+    elif args.batch is None:
+        if args.rooms is None or args.judgings_per_project is None:
+            parser.error("--rooms and --judgings-per-project are required")
+        if args.demo and (args.judges is None or args.projects is None):
+            parser.error("--demo requires --judges and --projects")
+        if args.overlap_aware and (args.exact or args.parallel > 1 or args.travel_matrix):
+            parser.error("--overlap-aware cannot be combined with --exact, --parallel or --travel-matrix")
+        if args.sharded and (args.exact or args.parallel > 1 or args.travel_matrix or args.overlap_aware):
+            parser.error("--sharded cannot be combined with --exact, --parallel, --travel-matrix or --overlap-aware")
+        if args.constraints and args.exact:
+            parser.error("--constraints cannot be combined with --exact")
+        if args.travel_matrix and (args.exact or args.parallel > 1):
+            parser.error("--travel-matrix cannot be combined with --exact or --parallel")
+    return args
+
+def main(argv: List[str] = None):
+    # With no flags, fall back to prompting for every parameter
+    args = parse_args(argv)
+    
+    if args.batch:
+        summary = run_batch(load_scenarios(args.batch), max_workers=args.workers)
+        print(summary.to_string(index=False))
+        if args.summary:
+            summary.to_csv(args.summary, index=False)
+            print(f"Saved batch summary to '{args.summary}'")
+        return
+    
+    if args.seed is not None:
+        random.seed(args.seed)
+    
+    report = RunReport(track_memory=args.report_memory) if args.report else None
+    
+    # Initialize system
+    system = JudgingSystem(num_rooms=args.rooms, judgings_per_project=args.judgings_per_project, demo_mode=args.demo,
+                           num_judges=args.judges, total_projects=args.projects,
+                           judges_path=args.judges_csv, projects_path=args.teams_csv, report=report,
+                           roster_cache=RosterCache(args.roster_cache) if args.roster_cache else DEFAULT_ROSTER_CACHE,
+                           constraints_path=args.constraints)
+    
+    travel = None
+    if args.travel_matrix:
+        travel = TravelModel.from_csv(args.travel_matrix, system.rooms, system.projects.table_numbers, args.slot_minutes)
+    
+    run_schedule(system, exact_mode=args.exact, parallel_attempts=args.parallel, best_of=args.best_of,
+                 max_attempts=args.max_attempts, output_path=args.output,
+                 base_seed=args.seed or 0, max_workers=args.workers,
+                 output_format=args.format, judge_sheets_dir=args.judge_sheets, travel=travel,
+                 optimize_seconds=args.optimize, overlap_aware=args.overlap_aware, show_graph_metrics=args.graph_metrics,
+                 sharded=args.sharded,
+                 template_cache=TemplateCache(args.template_cache) if args.template_cache else None)
+    
+    if report is not None:
+        report.to_json(args.report)
+        print(f"Saved run report to '{args.report}'")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
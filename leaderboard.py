@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+from typing import Dict, List, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+import argparse
+import asyncio
+import json
+import math
+import numpy as np
+import pandas as pd
+from score_log import ScoreLog, sample_std, standardized_sum
+
+class Leaderboard:
+    """
+    Incrementally maintained version of calculate_scores' ranking.
+
+    Each judge keeps online (n, mean, M2); each (judge, table) pair keeps its
+    point sum and count. A new score changes one judge's mean and std, so only
+    the tables that judge has scored are re-scored, each from the pairs of the
+    judges who saw it. Per-event cost depends on that judge's assignment count,
+    never on the number of scores seen so far.
+    """
+
+    def __init__(self, team_names: Dict[int, str] = None):
+        self.team_names = team_names or {}
+        self.judge_stats: Dict[int, List[float]] = {}
+        # Sample std per judge, refreshed whenever the judge's stats change; NaN while undefined
+        self.judge_stds: Dict[int, float] = {}
+        self.judge_tables: Dict[int, Set[int]] = {}
+        self.table_judges: Dict[int, Set[int]] = {}
+        self.pairs: Dict[Tuple[int, int], List[float]] = {}
+        self.table_scores: Dict[int, float] = {}
+        self.events = 0
+
+    def _update_std(self, judge: int):
+        n, _, m2 = self.judge_stats[judge]
+        self.judge_stds[judge] = float(sample_std(n, m2))
+
+    def _rescore_table(self, table: int):
+        total, count = 0.0, 0.0
+        for judge in self.table_judges[table]:
+            std = self.judge_stds[judge]
+            point_sum, point_count = self.pairs[(judge, table)]
+            if math.isnan(std) or point_count == 0:
+                continue
+            total += standardized_sum(point_sum, point_count, self.judge_stats[judge][1], std)
+            count += point_count
+        self.table_scores[table] = total / count if count else math.nan
+
+    def add_score(self, judge: int, table: int, points: float):
+        self.events += 1
+        self.table_judges.setdefault(table, set()).add(judge)
+        self.judge_tables.setdefault(judge, set()).add(table)
+        pair = self.pairs.setdefault((judge, table), [0.0, 0.0])
+        stats = self.judge_stats.setdefault(judge, [0, 0.0, 0.0])
+
+        if points is not None and not math.isnan(points):
+            pair[0] += points
+            pair[1] += 1
+            # Welford update of the judge's mean and M2
+            stats[0] += 1
+            delta = points - stats[1]
+            stats[1] += delta / stats[0]
+            stats[2] += delta * (points - stats[1])
+        self._update_std(judge)
+
+        for affected in self.judge_tables[judge]:
+            self._rescore_table(affected)
+
+    def add_scores(self, judges: np.ndarray, tables: np.ndarray, points: np.ndarray):
+        """
+        Bulk add_score for whole arrays, e.g. a score log's mapped columns.
+        Per-judge (n, mean, M2) and per-pair sums are computed with bincount
+        and merged into the running state, then each affected table is
+        re-scored once instead of once per score.
+        """
+        if len(judges) == 0:
+            return
+        judges = np.asarray(judges, dtype=np.int64)
+        tables = np.asarray(tables, dtype=np.int64)
+        points = np.asarray(points, dtype=np.float64)
+        self.events += len(judges)
+        scored = ~np.isnan(points)
+        values = np.where(scored, points, 0.0)
+
+        judge_ids, judge_codes = np.unique(judges, return_inverse=True)
+        n = np.bincount(judge_codes, weights=scored, minlength=len(judge_ids))
+        mean = np.bincount(judge_codes, weights=values, minlength=len(judge_ids)) / np.where(n > 0, n, 1)
+        m2 = np.bincount(judge_codes, weights=np.where(scored, values - mean[judge_codes], 0.0) ** 2, minlength=len(judge_ids))
+        for judge, batch_n, batch_mean, batch_m2 in zip(judge_ids.tolist(), n.tolist(), mean.tolist(), m2.tolist()):
+            # Chan et al. merge of the batch into the judge's running (n, mean, M2)
+            stats = self.judge_stats.setdefault(judge, [0, 0.0, 0.0])
+            total = stats[0] + batch_n
+            if total:
+                delta = batch_mean - stats[1]
+                stats[2] += batch_m2 + delta ** 2 * stats[0] * batch_n / total
+                stats[1] += delta * batch_n / total
+                stats[0] = int(total)
+            self._update_std(judge)
+
+        # (judge, table) pairs encoded as one integer each, so a 1-D unique finds them
+        table_ids, table_codes = np.unique(tables, return_inverse=True)
+        pairs, pair_codes = np.unique(judge_codes.astype(np.int64) * len(table_ids) + table_codes, return_inverse=True)
+        sums = np.bincount(pair_codes, weights=values, minlength=len(pairs))
+        counts = np.bincount(pair_codes, weights=scored, minlength=len(pairs))
+        pair_judge_codes = pairs // len(table_ids)
+        pair_table_codes = pairs % len(table_ids)
+        pair_judges = judge_ids[pair_judge_codes]
+        pair_tables = table_ids[pair_table_codes]
+
+        if not self.pairs:
+            # Replay into an empty leaderboard: the batch is the whole state, so tables are scored with bincount
+            self._load_pairs(pair_judges, pair_tables, sums, counts)
+            std = sample_std(n, m2)[pair_judge_codes]
+            valid = ~np.isnan(std) & (counts > 0)
+            contributions = np.where(valid, standardized_sum(sums, counts, mean[pair_judge_codes], std), 0.0)
+            totals = np.bincount(pair_table_codes, weights=contributions, minlength=len(table_ids))
+            weights = np.bincount(pair_table_codes, weights=np.where(valid, counts, 0.0), minlength=len(table_ids))
+            self.table_scores.update(zip(table_ids.tolist(), (totals / np.where(weights > 0, weights, np.nan)).tolist()))
+            return
+
+        for judge, table, pair_sum, pair_count in zip(pair_judges.tolist(), pair_tables.tolist(), sums.tolist(), counts.tolist()):
+            pair = self.pairs.setdefault((judge, table), [0.0, 0.0])
+            pair[0] += pair_sum
+            pair[1] += pair_count
+            self.table_judges.setdefault(table, set()).add(judge)
+            self.judge_tables.setdefault(judge, set()).add(table)
+
+        affected = set()
+        for judge in judge_ids.tolist():
+            affected |= self.judge_tables[judge]
+        for table in affected:
+            self._rescore_table(table)
+
+    def _load_pairs(self, judges: np.ndarray, tables: np.ndarray, sums: np.ndarray, counts: np.ndarray):
+        # Builds pairs and both adjacency maps in bulk from unique pairs sorted by judge
+        self.pairs = {pair: [pair_sum, pair_count] for pair, pair_sum, pair_count
+                      in zip(zip(judges.tolist(), tables.tolist()), sums.tolist(), counts.tolist())}
+        by_table = np.argsort(tables, kind='stable')
+        for keys, values, adjacency in ((judges, tables, self.judge_tables),
+                                        (tables[by_table], judges[by_table], self.table_judges)):
+            breaks = np.flatnonzero(np.diff(keys)) + 1
+            starts = np.concatenate(([0], breaks))
+            for key, group in zip(keys[starts].tolist(), np.split(values, breaks)):
+                adjacency[key] = set(group.tolist())
+
+    def ranking(self, top: int = None) -> List[Dict]:
+        # Highest standardized mean first; tables without a defined score last, as in sort_values
+        ordered = sorted(self.table_scores.items(),
+                         key=lambda item: (math.isnan(item[1]), -item[1] if not math.isnan(item[1]) else 0.0))
+        if top is not None:
+            ordered = ordered[:top]
+        return [
+            {
+                'rank': rank,
+                'tableNumber': table,
+                'teamName': self.team_names.get(table),
+                'standardizedPoints': None if math.isnan(score) else score,
+                'judgeCount': len(self.table_judges[table]),
+            }
+            for rank, (table, score) in enumerate(ordered, start=1)
+        ]
+
+class LeaderboardServer:
+    """
+    Minimal HTTP/1.1 endpoint over asyncio streams:
+      POST /scores       body: one {judgeNumber, tableNumber, points} object or a list of them
+      GET  /leaderboard  optional ?top=N
+    """
+
+    def __init__(self, leaderboard: Leaderboard, log: ScoreLog = None):
+        self.leaderboard = leaderboard
+        # Accepted scores are appended here before they are applied
+        self.log = log
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: str, payload):
+        body = json.dumps(payload).encode()
+        writer.write(f'HTTP/1.1 {status}\r\nContent-Type: application/json\r\n'
+                     f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode() + body)
+        await writer.drain()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request_line = (await reader.readline()).decode().split()
+            headers = {}
+            while True:
+                line = (await reader.readline()).decode().strip()
+                if not line:
+                    break
+                name, _, value = line.partition(':')
+                headers[name.strip().lower()] = value.strip()
+            if len(request_line) < 2:
+                await self._respond(writer, '400 Bad Request', {'error': 'malformed request line'})
+                return
+
+            method, target = request_line[0], urlsplit(request_line[1])
+            if method == 'GET' and target.path == '/leaderboard':
+                top = parse_qs(target.query).get('top')
+                await self._respond(writer, '200 OK', {
+                    'events': self.leaderboard.events,
+                    'ranking': self.leaderboard.ranking(int(top[0]) if top else None),
+                })
+            elif method == 'POST' and target.path == '/scores':
+                length = headers.get('content-length', '0')
+                if not length.isdigit():
+                    await self._respond(writer, '400 Bad Request', {'error': f'invalid Content-Length: {length!r}'})
+                    return
+                try:
+                    body = await reader.readexactly(int(length))
+                except asyncio.IncompleteReadError as e:
+                    await self._respond(writer, '400 Bad Request', {
+                        'error': f'body ended after {len(e.partial)} of {length} bytes'})
+                    return
+                events = json.loads(body or b'[]')
+                events = events if isinstance(events, list) else [events]
+                scores = [(int(event['judgeNumber']), int(event['tableNumber']), float(event['points'])) for event in events]
+                if self.log is not None and scores:
+                    self.log.extend(*zip(*scores))
+                for judge, table, points in scores:
+                    self.leaderboard.add_score(judge, table, points)
+                await self._respond(writer, '200 OK', {'accepted': len(events), 'events': self.leaderboard.events})
+            else:
+                await self._respond(writer, '404 Not Found', {'error': f'no route for {method} {target.path}'})
+        except (ValueError, KeyError, TypeError) as e:
+            await self._respond(writer, '400 Bad Request', {'error': str(e)})
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = '127.0.0.1', port: int = 8080):
+        server = await asyncio.start_server(self.handle, host, port)
+        async with server:
+            await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a live standardized-score leaderboard.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--teams', help="teams.csv with tableNumber and teamName columns")
+    parser.add_argument('--points', help="points.csv to replay before serving")
+    parser.add_argument('--log', help="binary score log to replay before serving; new scores are appended to it")
+    args = parser.parse_args(argv)
+
+    team_names = {}
+    if args.teams:
+        teams = pd.read_csv(args.teams)
+        team_names = dict(zip(teams['tableNumber'].tolist(), teams['teamName'].tolist()))
+    leaderboard = Leaderboard(team_names)
+    if args.points:
+        points = pd.read_csv(args.points, usecols=['judgeNumber', 'tableNumber', 'points'])
+        leaderboard.add_scores(points['judgeNumber'].to_numpy(), points['tableNumber'].to_numpy(), points['points'].to_numpy())
+    log = None
+    if args.log:
+        # The server appends to the log, so a new one is started if needed
+        log = ScoreLog(args.log, create=True)
+        records = log.records()
+        leaderboard.add_scores(records['judge'], records['table'], records['points'])
+
+    print(f"Serving leaderboard on http://{args.host}:{args.port}/leaderboard")
+    asyncio.run(LeaderboardServer(leaderboard, log).serve(args.host, args.port))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+import argparse
+import math
+import numpy as np
+import pandas as pd
+from assignment_export import AssignmentExporter
+from assignment_matrix import AssignmentMatrix, EMPTY
+from judging_assignments import AssignmentGenerator, AssignmentVerifier, JudgingSystem, VerificationIssue
+from roster_loader import load_judges, load_teams
+from roster_store import JudgeStore, ProjectStore
+
+DOUBLE_BOOKING = 'double_booking'
+
+@dataclass
+class Track:
+    name: str
+    teams_path: str
+    num_rooms: int
+    judgings_per_project: int
+    # Judges who only judge this track; shared judges are given separately
+    judges_path: Optional[str] = None
+
+def load_tracks(path: str) -> List[Track]:
+    """
+    Reads a track config CSV with columns name, teams, rooms,
+    judgings_per_project and optionally judges (dedicated judge roster).
+    """
+    df = pd.read_csv(path)
+    tracks = []
+    for row in df.to_dict('records'):
+        judges = row.get('judges')
+        tracks.append(Track(
+            name=str(row['name']),
+            teams_path=str(row['teams']),
+            num_rooms=int(row['rooms']),
+            judgings_per_project=int(row['judgings_per_project']),
+            judges_path=str(judges) if isinstance(judges, str) and judges.strip() else None
+        ))
+    return tracks
+
+def plan_loads(demands: List[int], dedicated: List[int], num_shared: int) -> Tuple[List[List[int]], List[Dict[int, int]]]:
+    """
+    Splits each track's judgings (projects x judgings_per_project) between its
+    dedicated judges and the shared pool so every judge ends up with about the
+    same total load. Returns per-track dedicated loads and, per shared judge,
+    a {track index: load} split. Shared judges are poured into tracks in
+    order, so each one spans as few tracks as possible.
+    """
+    total_judges = sum(dedicated) + num_shared
+    if total_judges == 0:
+        raise ValueError("Multi-track scheduling needs at least one judge")
+
+    # A track too small to give each dedicated judge per_judge + 1 keeps all its judgings for them;
+    # the share is then worked out again over the other judges and judgings until no more tracks drop out
+    limited: Set[int] = set()
+    while True:
+        judges = total_judges - sum(dedicated[track] for track in limited)
+        if judges == 0:
+            per_judge, extra = 0, 0
+            break
+        per_judge, extra = divmod(sum(demands) - sum(demands[track] for track in limited), judges)
+        newly_limited = {track for track, (demand, count) in enumerate(zip(demands, dedicated))
+                         if count and track not in limited and demand < count * (per_judge + 1)}
+        if not newly_limited:
+            break
+        limited |= newly_limited
+
+    dedicated_loads = []
+    remaining = []
+    for track, (demand, count) in enumerate(zip(demands, dedicated)):
+        if track in limited:
+            taken = demand
+        else:
+            # extra judges across the whole event carry per_judge + 1; dedicated judges take theirs before the pool
+            bonus = min(count, extra)
+            extra -= bonus
+            taken = count * per_judge + bonus
+        dedicated_loads.append([taken // count + (1 if i < taken % count else 0) for i in range(count)] if count else [])
+        remaining.append(demand - taken)
+
+    shared_splits: List[Dict[int, int]] = [{} for _ in range(num_shared)]
+    if num_shared == 0:
+        # No pool to fall back on: dedicated judges take the rest of their own track
+        for track, loads in enumerate(dedicated_loads):
+            if remaining[track] and not loads:
+                raise ValueError(f"Track {track + 1} has no dedicated judges and there are no shared judges")
+            for i in range(remaining[track]):
+                loads[i % len(loads)] += 1
+            remaining[track] = 0
+        return dedicated_loads, shared_splits
+
+    pool = sum(remaining)
+    track = 0
+    for judge in range(num_shared):
+        capacity = pool // num_shared + (1 if judge < pool % num_shared else 0)
+        while capacity > 0:
+            while remaining[track] == 0:
+                track += 1
+            amount = min(capacity, remaining[track])
+            shared_splits[judge][track] = amount
+            remaining[track] -= amount
+            capacity -= amount
+    return dedicated_loads, shared_splits
+
+class TrackAssignmentGenerator(AssignmentGenerator):
+    """
+    AssignmentGenerator with an explicit judging target per judge, so a
+    shared judge can carry only part of a load in each track.
+    """
+
+    def __init__(self, system: JudgingSystem, target_loads: List[int], seed: int = None):
+        super().__init__(system, seed)
+        self.target_loads = list(target_loads)
+        self.max_per_judge = max(self.target_loads, default=0)
+        self.teams_per_phase = math.ceil(self.max_per_judge / system.num_rooms)
+        self.assignments = AssignmentMatrix.empty(
+            system.num_judges, system.num_rooms * self.teams_per_phase, system.total_projects
+        )
+
+    def _get_target_assignments(self, judge_id: int) -> int:
+        return self.target_loads[judge_id]
+
+@dataclass
+class TrackPlan:
+    name: str
+    system: JudgingSystem
+    target_loads: List[int]
+    # Row in the combined schedule of each of this track's judges
+    judge_rows: List[int]
+    seed: int = 0
+    max_attempts: int = 10
+
+def _track_issues(system: JudgingSystem, matrix: AssignmentMatrix) -> List[VerificationIssue]:
+    # Per-track loads are partial for shared judges, so workload is only checked on the combined schedule
+    return [
+        issue for issue in AssignmentVerifier(None, system, matrix).find_issues()
+        if issue.kind != AssignmentVerifier.JUDGE_WORKLOAD
+    ]
+
+def generate_track(plan: TrackPlan) -> Tuple[AssignmentMatrix, int]:
+    # Seeded retries until the track verifies; returns the last attempt otherwise
+    for attempt in range(plan.max_attempts):
+        generator = TrackAssignmentGenerator(plan.system, plan.target_loads, seed=plan.seed + attempt)
+        generator._create_balanced_assignments()
+        if not _track_issues(plan.system, generator.assignments):
+            break
+    return generator.assignments, attempt + 1
+
+def reconcile_shared_judges(plans: List[TrackPlan], matrices: List[AssignmentMatrix],
+                            num_judges: int) -> Tuple[List[AssignmentMatrix], int]:
+    """
+    Tracks are laid on one shared slot clock in order. When a judge is already
+    busy in a slot from an earlier track, their judging in the later track is
+    moved, within that judge's own row, to the earliest slot where they are
+    free and the project is not already being judged; a new slot is added if
+    there is none. Moves keep every project count and judge load. Returns
+    the reconciled matrices and the number of moves.
+    """
+    busy: List[Set[int]] = [set() for _ in range(num_judges)]
+    reconciled = []
+    moves = 0
+    for plan, matrix in zip(plans, matrices):
+        data = matrix.data.copy()
+        slot_projects = [set(data[:, slot][data[:, slot] != EMPTY].tolist()) for slot in range(data.shape[1])]
+        for local, judge in enumerate(plan.judge_rows):
+            for slot in np.flatnonzero(data[local] != EMPTY).tolist():
+                if slot not in busy[judge]:
+                    continue
+                project = int(data[local, slot])
+                target = next((other for other in range(data.shape[1])
+                               if other not in busy[judge] and data[local, other] == EMPTY
+                               and project not in slot_projects[other]), None)
+                if target is None:
+                    data = np.hstack([data, np.full((data.shape[0], 1), EMPTY, dtype=np.int32)])
+                    slot_projects.append(set())
+                    target = data.shape[1] - 1
+                data[local, target] = project
+                data[local, slot] = EMPTY
+                slot_projects[slot].discard(project)
+                slot_projects[target].add(project)
+                moves += 1
+            busy[judge].update(np.flatnonzero(data[local] != EMPTY).tolist())
+        reconciled.append(AssignmentMatrix(data, matrix.num_projects))
+    return reconciled, moves
+
+@dataclass
+class MultiTrackResult:
+    system: JudgingSystem
+    matrix: AssignmentMatrix
+    # (track name, issue); double bookings are reported under 'all tracks'
+    issues: List[Tuple[str, VerificationIssue]] = field(default_factory=list)
+    # Judges whose combined load is off the average by more than the usual deviation
+    workload_warnings: List[VerificationIssue] = field(default_factory=list)
+    attempts: Dict[str, int] = field(default_factory=dict)
+    shared_moves: int = 0
+
+    @property
+    def valid(self) -> bool:
+        return not self.issues
+
+    def report_lines(self) -> List[str]:
+        lines = [f"{track}: {attempts} attempt(s)" for track, attempts in self.attempts.items()]
+        lines.append(f"Shared-judge judgings moved to avoid double booking: {self.shared_moves}")
+        judge_names = self.system.judges.full_names()
+        for track, issue in self.issues:
+            if issue.kind == AssignmentVerifier.JUDGING_COUNT:
+                lines.append(f"[{track}] Project {issue.table} is judged {issue.count} times")
+            elif issue.kind == AssignmentVerifier.SIMULTANEOUS_JUDGING:
+                lines.append(f"[{track}] Project {issue.table} is judged more than once in Slot {issue.slot + 1}")
+            elif issue.kind == DOUBLE_BOOKING:
+                lines.append(f"[{track}] Judge {judge_names[issue.judge]} is booked in {issue.count} tracks in Slot {issue.slot + 1}")
+            else:
+                lines.append(f"[{track}] {issue.kind}: slot {issue.slot}, table {issue.table}, judge {issue.judge}")
+        loads = self.matrix.judge_loads()
+        for issue in self.workload_warnings:
+            lines.append(f"Warning: judge {judge_names[issue.judge]} has {issue.count} projects (average is {loads.mean():.1f})")
+        lines.append("All tracks verified" if self.valid else f"{len(self.issues)} issue(s) found")
+        return lines
+
+def build_plans(tracks: List[Track], shared_judges_path: Optional[str] = None, seed: int = 0,
+                max_attempts: int = 10) -> Tuple[List[TrackPlan], JudgingSystem, np.ndarray]:
+    """
+    Loads every roster and splits the load. Returns one plan per track, the
+    combined system (all judges, all projects labelled with their track) and
+    each track's project id offset in the combined schedule.
+    """
+    dedicated = [load_judges(track.judges_path) if track.judges_path else None for track in tracks]
+    shared = load_judges(shared_judges_path) if shared_judges_path else None
+    teams = [load_teams(track.teams_path) for track in tracks]
+
+    # Combined judge order: each track's dedicated judges, then the shared pool
+    first_names, last_names, dedicated_rows = [], [], []
+    for roster in dedicated:
+        start = len(first_names)
+        if roster is not None:
+            first_names.extend(roster.first_names.tolist())
+            last_names.extend(roster.last_names.tolist())
+        dedicated_rows.append(list(range(start, len(first_names))))
+    shared_start = len(first_names)
+    if shared is not None:
+        first_names.extend(shared.first_names.tolist())
+        last_names.extend(shared.last_names.tolist())
+    all_judges = JudgeStore(first_names, last_names)
+    num_shared = len(first_names) - shared_start
+
+    demands = [len(roster) * track.judgings_per_project for roster, track in zip(teams, tracks)]
+    dedicated_loads, shared_splits = plan_loads(demands, [len(rows) for rows in dedicated_rows], num_shared)
+
+    plans = []
+    for index, (track, roster) in enumerate(zip(tracks, teams)):
+        rows = list(dedicated_rows[index])
+        loads = list(dedicated_loads[index])
+        for judge, split in enumerate(shared_splits):
+            if split.get(index):
+                rows.append(shared_start + judge)
+                loads.append(split[index])
+        judges = JudgeStore([first_names[row] for row in rows], [last_names[row] for row in rows],
+                            all_judges.judge_ids[rows])
+        system = JudgingSystem.from_stores(judges, ProjectStore(roster.names.tolist(), roster.table_numbers),
+                                           track.num_rooms, track.judgings_per_project)
+        plans.append(TrackPlan(track.name, system, loads, rows, seed, max_attempts))
+
+    offsets = np.cumsum([0] + [len(roster) for roster in teams])
+    names = [f'{track.name}: {name}' for track, roster in zip(tracks, teams) for name in roster.names.tolist()]
+    table_numbers = np.concatenate([roster.table_numbers for roster in teams]) if teams else np.array([], dtype=np.int64)
+    combined = JudgingSystem.from_stores(all_judges, ProjectStore(names, table_numbers),
+                                         sum(track.num_rooms for track in tracks), max(track.judgings_per_project for track in tracks))
+    return plans, combined, offsets
+
+def run_multi_track(tracks: List[Track], shared_judges_path: Optional[str] = None, seed: int = 0,
+                    max_attempts: int = 10, max_workers: int = None) -> MultiTrackResult:
+    """
+    Generates every track in its own worker process, reconciles shared judges
+    onto one slot clock and verifies the combined schedule.
+    """
+    plans, combined, offsets = build_plans(tracks, shared_judges_path, seed, max_attempts)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        generated = list(executor.map(generate_track, plans))
+    matrices, moves = reconcile_shared_judges(plans, [matrix for matrix, _ in generated], combined.num_judges)
+
+    num_slots = max((matrix.num_slots for matrix in matrices), default=0)
+    data = np.full((combined.num_judges, num_slots), EMPTY, dtype=np.int32)
+    bookings = np.zeros((combined.num_judges, num_slots), dtype=np.int32)
+    issues = []
+    for index, (plan, matrix) in enumerate(zip(plans, matrices)):
+        issues.extend((plan.name, issue) for issue in _track_issues(plan.system, matrix))
+        rows = np.asarray(plan.judge_rows, dtype=np.intp)
+        filled = matrix.filled_mask()
+        bookings[rows, :matrix.num_slots] += filled
+        target = data[rows, :matrix.num_slots]
+        target[filled] = matrix.data[filled] + offsets[index]
+        data[rows, :matrix.num_slots] = target
+
+    for judge, slot in zip(*np.nonzero(bookings > 1)):
+        issues.append(('all tracks', VerificationIssue(DOUBLE_BOOKING, slot=int(slot), judge=int(judge),
+                                                       count=int(bookings[judge, slot]))))
+    result_matrix = AssignmentMatrix(data, combined.total_projects)
+    loads = result_matrix.judge_loads()
+    warnings = [
+        VerificationIssue(AssignmentVerifier.JUDGE_WORKLOAD, judge=judge, count=int(loads[judge]))
+        for judge in np.flatnonzero(np.abs(loads - loads.mean()) > AssignmentVerifier.MAX_WORKLOAD_DEVIATION).tolist()
+    ] if len(loads) else []
+    return MultiTrackResult(combined, result_matrix, issues, warnings,
+                            {plan.name: attempts for plan, (_, attempts) in zip(plans, generated)}, moves)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Schedule several concurrent tracks that share some judges.")
+    parser.add_argument('--tracks', required=True,
+                        help="CSV with name, teams, rooms, judgings_per_project and optional judges (dedicated roster) columns")
+    parser.add_argument('--shared-judges', help="judge roster of judges who float between tracks")
+    parser.add_argument('--output', default='assignments.csv')
+    parser.add_argument('--format', choices=['csv', 'long', 'binary'], default='csv')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-attempts', type=int, default=10, help="seeded retries per track")
+    parser.add_argument('--workers', type=int, help="worker processes, one track each")
+    args = parser.parse_args(argv)
+
+    result = run_multi_track(load_tracks(args.tracks), args.shared_judges, args.seed, args.max_attempts, args.workers)
+    for line in result.report_lines():
+        print(line)
+    if result.valid:
+        AssignmentExporter(result.system, result.matrix).write(args.output, args.format)
+        print(f"Saved combined assignments to '{args.output}'")
+    return result.valid
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING, Dict, Tuple
+import argparse
+import numpy as np
+from assignment_matrix import AssignmentMatrix, EMPTY
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+@dataclass
+class GraphMetrics:
+    judges: int
+    components: int
+    largest_component: int
+    # Judges who share no project with any other judge
+    isolated_judges: int
+    # Distinct judges each judge shares at least one project with
+    mean_degree: float
+    min_degree: int
+    # Second-smallest eigenvalue of the normalized Laplacian of the co-review graph (0 when disconnected)
+    spectral_gap: float
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def summary(self) -> str:
+        return (f"Judge co-review graph: {self.components} component(s), largest {self.largest_component}/{self.judges} judges, "
+                f"{self.isolated_judges} isolated, degree mean {self.mean_degree:.1f} / min {self.min_degree}, "
+                f"spectral gap {self.spectral_gap:.4f}")
+
+# Lanczos steps used at most to estimate the spectral gap, and the change in the estimate treated as converged
+LANCZOS_STEPS = 300
+LANCZOS_TOLERANCE = 1e-9
+
+def coreview_pairs(matrix: AssignmentMatrix) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The co-review graph as (judge, other judge, shared project count) edges,
+    listed in both directions. Pairs come from each project's own judges, so
+    the work grows with projects x judgings_per_project^2, never with
+    judges x judges.
+    """
+    judges, slots = np.nonzero(matrix.filled_mask())
+    projects = matrix.data[judges, slots]
+    # Each project's judges become one contiguous run
+    order = np.lexsort((judges, projects))
+    judges, projects = judges[order].astype(np.int64), projects[order]
+    firsts, seconds = [], []
+    for offset in range(1, int(np.bincount(projects).max(initial=0))):
+        same = projects[offset:] == projects[:-offset]
+        firsts.append(judges[:-offset][same])
+        seconds.append(judges[offset:][same])
+    if not firsts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+    first, second = np.concatenate(firsts), np.concatenate(seconds)
+    keys = np.concatenate([first * matrix.num_judges + second, second * matrix.num_judges + first])
+    keys, counts = np.unique(keys, return_counts=True)
+    return keys // matrix.num_judges, keys % matrix.num_judges, counts
+
+def _components(num_nodes: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    # Component label per node: every node takes its smallest neighbour label, with pointer jumping, until stable
+    labels = np.arange(num_nodes)
+    while True:
+        updated = labels.copy()
+        np.minimum.at(updated, rows, labels[cols])
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+    return np.unique(labels, return_inverse=True)[1]
+
+def _spectral_gap(num_nodes: int, rows: np.ndarray, cols: np.ndarray, weights: np.ndarray) -> float:
+    """
+    Second-smallest eigenvalue of the normalized Laplacian I - S of a
+    connected graph, S = D^-1/2 W D^-1/2, as 1 minus the largest eigenvalue
+    of S once its known top eigenvector D^1/2 1 is projected out. Lanczos
+    with full reorthogonalization finds it with sparse products only.
+    """
+    degree = np.bincount(rows, weights=weights, minlength=num_nodes)
+    scale = 1 / np.sqrt(degree)
+    values = weights * scale[rows] * scale[cols]
+    top = np.sqrt(degree) / np.linalg.norm(np.sqrt(degree))
+
+    def apply(vector: np.ndarray) -> np.ndarray:
+        result = np.bincount(rows, weights=values * vector[cols], minlength=num_nodes)
+        return result - top * (top @ result)
+
+    vector = np.random.default_rng(0).standard_normal(num_nodes)
+    vector -= top * (top @ vector)
+    basis = [vector / np.linalg.norm(vector)]
+    alphas, betas = [], []
+    estimate = None
+    for _ in range(min(num_nodes - 1, LANCZOS_STEPS)):
+        result = apply(basis[-1])
+        alphas.append(float(basis[-1] @ result))
+        stacked = np.array(basis)
+        result -= stacked.T @ (stacked @ result)
+        ritz = np.linalg.eigvalsh(np.diag(alphas) + np.diag(betas, 1) + np.diag(betas, -1))[-1]
+        beta = float(np.linalg.norm(result))
+        if beta < LANCZOS_TOLERANCE or (estimate is not None and abs(ritz - estimate) < LANCZOS_TOLERANCE):
+            estimate = ritz
+            break
+        estimate = ritz
+        betas.append(beta)
+        basis.append(result / beta)
+    return float(1 - estimate)
+
+def graph_metrics(matrix: AssignmentMatrix) -> GraphMetrics:
+    rows, cols, shared = coreview_pairs(matrix)
+    degree = np.bincount(rows, minlength=matrix.num_judges)
+    labels = _components(matrix.num_judges, rows, cols)
+    sizes = np.bincount(labels) if len(labels) else np.array([0])
+
+    spectral_gap = 0.0
+    if len(sizes) == 1 and matrix.num_judges > 1:
+        spectral_gap = _spectral_gap(matrix.num_judges, rows, cols, shared.astype(np.float64))
+
+    return GraphMetrics(
+        judges=matrix.num_judges,
+        components=len(sizes),
+        largest_component=int(sizes.max()),
+        isolated_judges=int(np.count_nonzero(degree == 0)),
+        mean_degree=float(degree.mean()) if len(degree) else 0.0,
+        min_degree=int(degree.min()) if len(degree) else 0,
+        spectral_gap=round(max(spectral_gap, 0.0), 6),
+    )
+
+def matrix_from_csv(path: str) -> AssignmentMatrix:
+    # Any assignments CSV: team labels are mapped to ids by first appearance, names are not needed
+    import pandas as pd
+    df = pd.read_csv(path, index_col=0)
+    cells = df[[column for column in df.columns if column.startswith('Slot')]].to_numpy(dtype=object).ravel()
+    empty = pd.isna(cells) | (cells == 'No team for this time slot')
+    codes, labels = pd.factorize(pd.Series(cells).where(~empty))
+    data = np.where(codes >= 0, codes + 1, EMPTY).reshape(len(df), -1)
+    return AssignmentMatrix(data, len(labels))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report how well judges' project sets overlap in an assignments CSV.")
+    parser.add_argument('assignments', nargs='?', default='assignments.csv')
+    args = parser.parse_args(argv)
+    print(graph_metrics(matrix_from_csv(args.assignments)).summary())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import csv
+import hashlib
+import os
+import pickle
+import numpy as np
+
+JUDGE_COLUMNS = ['judgeFirstName', 'judgeLastName']
+TEAM_COLUMNS = ['teamName', 'tableNumber']
+# Bump when the parsed layout changes so stale on-disk cache entries are ignored
+CACHE_VERSION = 1
+DEFAULT_CHUNKSIZE = 100_000
+# Fields pandas' read_csv treats as missing by default, so rosters validate the same as before
+NA_VALUES = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                       '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
+
+class RosterError(ValueError):
+    pass
+
+@dataclass
+class JudgeRoster:
+    first_names: np.ndarray
+    last_names: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.first_names)
+
+@dataclass
+class TeamRoster:
+    names: np.ndarray
+    table_numbers: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+class RosterCache:
+    """
+    Parsed rosters keyed by the SHA-256 of the file's bytes, so an unchanged
+    CSV is never parsed twice. Entries live in memory and, when a directory
+    is given, are also pickled there so separate runs can share them.
+    """
+
+    def __init__(self, directory: str = None):
+        self.directory = directory
+        self.entries: Dict[str, object] = {}
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(path: str, kind: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return f'{kind}-v{CACHE_VERSION}-{digest.hexdigest()}'
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    def get(self, key: str):
+        if key in self.entries:
+            return self.entries[key]
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), 'rb') as f:
+                self.entries[key] = pickle.load(f)
+            return self.entries[key]
+        return None
+
+    def put(self, key: str, roster):
+        self.entries[key] = roster
+        if self.directory:
+            with open(self._path(key), 'wb') as f:
+                pickle.dump(roster, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _read_columns(path: str, columns: List[str], chunksize: int) -> Dict[str, np.ndarray]:
+    """
+    Reads only the needed columns with the csv module, turning every
+    chunksize rows into object arrays. Missing values become None. Blank lines
+    are skipped, as read_csv does, and a leading UTF-8 BOM is ignored.
+    """
+    parts = {column: [] for column in columns}
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        while header == []:
+            header = next(reader, None)
+        if header is None:
+            raise RosterError(f"'{path}' is empty")
+        missing = [column for column in columns if column not in header]
+        if missing:
+            raise RosterError(f"'{path}' is missing required columns: {', '.join(missing)}")
+        positions = [header.index(column) for column in columns]
+
+        batch = {column: [] for column in columns}
+        for row in reader:
+            if not row:
+                continue
+            for column, position in zip(columns, positions):
+                value = row[position] if position < len(row) else ''
+                batch[column].append(None if value in NA_VALUES else value)
+            if len(batch[columns[0]]) >= chunksize:
+                for column in columns:
+                    parts[column].append(np.array(batch[column], dtype=object))
+                    batch[column] = []
+        for column in columns:
+            parts[column].append(np.array(batch[column], dtype=object))
+    return {column: np.concatenate(parts[column]) for column in columns}
+
+def _check_present(path: str, column: str, values: np.ndarray):
+    missing = np.flatnonzero(np.equal(values, None))
+    if len(missing):
+        # Report data rows 1-based, after the header line
+        rows = ', '.join(str(row + 2) for row in missing[:10].tolist())
+        raise RosterError(f"'{path}' has missing {column} values on line(s) {rows}")
+
+def _to_number(text: str) -> float:
+    try:
+        return float(text.strip())
+    except ValueError:
+        return np.nan
+
+def parse_judges(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> JudgeRoster:
+    columns = _read_columns(path, JUDGE_COLUMNS, chunksize)
+    for column in JUDGE_COLUMNS:
+        _check_present(path, column, columns[column])
+    return JudgeRoster(columns['judgeFirstName'].astype(str), columns['judgeLastName'].astype(str))
+
+def parse_teams(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> TeamRoster:
+    columns = _read_columns(path, TEAM_COLUMNS, chunksize)
+    for column in TEAM_COLUMNS:
+        _check_present(path, column, columns[column])
+
+    tables = np.array([_to_number(text) for text in columns['tableNumber'].tolist()], dtype=np.float64)
+    invalid = np.flatnonzero(~np.isfinite(tables) | (tables != np.floor(tables)) | (tables < 1))
+    if len(invalid):
+        rows = ', '.join(str(row + 2) for row in invalid[:10].tolist())
+        raise RosterError(f"'{path}' has table numbers that are not positive integers on line(s) {rows}")
+    tables = tables.astype(np.int64)
+
+    unique, counts = np.unique(tables, return_counts=True)
+    duplicates = unique[counts > 1]
+    if len(duplicates):
+        raise RosterError(f"'{path}' has duplicate table numbers: {', '.join(map(str, duplicates[:10].tolist()))}")
+    return TeamRoster(columns['teamName'].astype(str), tables)
+
+def load_judges(path: str, cache: Optional[RosterCache] = None, chunksize: int = DEFAULT_CHUNKSIZE) -> JudgeRoster:
+    if cache is None:
+        return parse_judges(path, chunksize)
+    key = RosterCache.key(path, 'judges')
+    roster = cache.get(key)
+    if roster is None:
+        roster = parse_judges(path, chunksize)
+        cache.put(key, roster)
+    return roster
+
+def load_teams(path: str, cache: Optional[RosterCache] = None, chunksize: int = DEFAULT_CHUNKSIZE) -> TeamRoster:
+    if cache is None:
+        return parse_teams(path, chunksize)
+    key = RosterCache.key(path, 'teams')
+    roster = cache.get(key)
+    if roster is None:
+        roster = parse_teams(path, chunksize)
+        cache.put(key, roster)
+    return roster
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+from abc import ABC, abstractmethod
+from typing import Iterable, Iterator, List, Sequence
+import numpy as np
+
+class JudgeView:
+    # Read-only view of one judge row in a JudgeStore
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'JudgeStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def first_name(self) -> str:
+        return self._store.first_names[self._index]
+
+    @property
+    def last_name(self) -> str:
+        return self._store.last_names[self._index]
+
+    @property
+    def judge_id(self) -> int:
+        return int(self._store.judge_ids[self._index])
+
+    def __repr__(self) -> str:
+        return f'Judge(first_name={self.first_name!r}, last_name={self.last_name!r}, judge_id={self.judge_id})'
+
+class ProjectView:
+    # Read-only view of one project row in a ProjectStore
+    __slots__ = ('_store', '_index')
+
+    def __init__(self, store: 'ProjectStore', index: int):
+        self._store = store
+        self._index = index
+
+    @property
+    def name(self) -> str:
+        return self._store.names[self._index]
+
+    @property
+    def table_number(self) -> int:
+        return int(self._store.table_numbers[self._index])
+
+    def __repr__(self) -> str:
+        return f'Project(name={self.name!r}, table_number={self.table_number})'
+
+class RoomView:
+    # Read-only view of one room; its projects are a range of project ids, never a materialized list
+    __slots__ = ('room_id', 'projects')
+
+    def __init__(self, room_id: int, projects: range):
+        self.room_id = room_id
+        self.projects = projects
+
+    def __repr__(self) -> str:
+        return f'Room(room_id={self.room_id}, projects={self.projects!r})'
+
+class _ColumnStore(ABC):
+    _view = None
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def __getitem__(self, index: int):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f'{type(self).__name__} index out of range')
+        return self._make_view(index)
+
+    def __iter__(self) -> Iterator:
+        for index in range(len(self)):
+            yield self._make_view(index)
+
+    def _make_view(self, index: int):
+        return self._view(self, index)
+
+class JudgeStore(_ColumnStore):
+    """
+    Judges stored as parallel columns. Indexing and iteration yield JudgeView
+    objects with the same attributes as Judge.
+    """
+    _view = JudgeView
+
+    def __init__(self, first_names: List[str], last_names: List[str], judge_ids: Sequence[int] = None):
+        self.first_names = list(first_names)
+        self.last_names = list(last_names)
+        if judge_ids is None:
+            judge_ids = np.arange(1001, 1001 + len(self.first_names))
+        self.judge_ids = np.asarray(judge_ids, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.first_names)
+
+    def extend(self, judges: Iterable):
+        judges = list(judges)
+        self.first_names.extend(judge.first_name for judge in judges)
+        self.last_names.extend(judge.last_name for judge in judges)
+        self.judge_ids = np.concatenate([self.judge_ids, np.array([judge.judge_id for judge in judges], dtype=np.int64)])
+
+    def full_names(self) -> List[str]:
+        return [f'{first_name} {last_name}' for first_name, last_name in zip(self.first_names, self.last_names)]
+
+class ProjectStore(_ColumnStore):
+    """
+    Projects stored as parallel columns; project id p is row p - 1. Indexing
+    and iteration yield ProjectView objects with name and table_number.
+    """
+    _view = ProjectView
+
+    def __init__(self, names: List[str], table_numbers: Sequence[int]):
+        self.names = list(names)
+        self.table_numbers = np.asarray(table_numbers, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def labels(self) -> List[str]:
+        return [f'{name} (Table {table_number})' for name, table_number in zip(self.names, self.table_numbers.tolist())]
+
+class RoomStore(_ColumnStore):
+    """
+    Rooms as contiguous blocks of project ids: room i holds ids
+    offsets[i] + 1 .. offsets[i + 1].
+    """
+
+    def __init__(self, offsets: Sequence[int]):
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def _make_view(self, index: int) -> RoomView:
+        return RoomView(index + 1, range(int(self.offsets[index]) + 1, int(self.offsets[index + 1]) + 1))
+
+    def room_of(self, project_ids: np.ndarray) -> np.ndarray:
+        # 0-based room index of each project id
+        return np.searchsorted(self.offsets, project_ids, side='left') - 1
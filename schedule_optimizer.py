@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass
+from typing import Dict, List, Set
+import math
+import random
+import time
+import numpy as np
+from assignment_matrix import AssignmentMatrix, EMPTY
+
+@dataclass
+class ScheduleStats:
+    slots: int
+    idle_cells: int
+    load_spread: int
+    load_std: float
+
+    @classmethod
+    def of(cls, matrix: AssignmentMatrix) -> 'ScheduleStats':
+        loads = matrix.judge_loads()
+        return cls(
+            slots=matrix.num_slots,
+            idle_cells=matrix.idle_cells(),
+            load_spread=int(loads.max() - loads.min()) if len(loads) else 0,
+            load_std=round(float(loads.std()), 3) if len(loads) else 0.0,
+        )
+
+@dataclass
+class OptimizationResult:
+    matrix: AssignmentMatrix
+    before: ScheduleStats
+    after: ScheduleStats
+    iterations: int
+    # Accepted steps behind the returned matrix; both are 0 when the input is kept
+    moves: int
+    swaps: int
+    seconds: float
+
+class LocalSearchOptimizer:
+    """
+    Simulated annealing over two steps: move one judging to an empty cell, or
+    swap two slots within one judge's row (cost-neutral, it only reshuffles
+    which slots have room).
+
+    The cost is a weighted sum of the number of non-empty slots, each
+    judging's slot index (pulling work towards the front so trailing slots
+    empty out) and the sum of squared judge loads (the total is fixed, so
+    this is the load variance). Per-slot project sets, per-judge project sets,
+    slot fill counts and loads are kept incrementally, so a move is checked
+    and scored in O(1).
+
+    A move never puts a project twice in one slot, gives a judge a project
+    they already see, breaks a conflict, or pushes a judge's load further
+    than max_deviation from the (fixed) average, so project counts and the
+    verifier's guarantees are preserved. Empty slots are dropped at the end.
+    """
+
+    def __init__(self, matrix: AssignmentMatrix, seed: int = None, time_budget: float = 1.0,
+                 max_deviation: float = 2, constraints=None, swap_rate: float = 0.5):
+        self.matrix = matrix
+        self.swap_rate = swap_rate
+        self.rng = random.Random(seed)
+        self.time_budget = time_budget
+        self.max_deviation = max_deviation
+        self.constraints = constraints
+
+    def optimize(self) -> OptimizationResult:
+        start = time.perf_counter()
+        before = ScheduleStats.of(self.matrix)
+        rows: List[List[int]] = self.matrix.data.tolist()
+        num_judges, num_slots = self.matrix.data.shape
+        if num_judges == 0 or num_slots == 0:
+            return OptimizationResult(self.matrix.copy(), before, before, 0, 0, 0, 0.0)
+
+        slot_projects: List[Set[int]] = [set() for _ in range(num_slots)]
+        judge_projects: List[Set[int]] = [set() for _ in range(num_judges)]
+        slot_fill = [0] * num_slots
+        loads = [0] * num_judges
+        filled_cells = []
+        for judge, row in enumerate(rows):
+            for slot, project in enumerate(row):
+                if project != EMPTY:
+                    slot_projects[slot].add(project)
+                    judge_projects[judge].add(project)
+                    slot_fill[slot] += 1
+                    loads[judge] += 1
+                    filled_cells.append((judge, slot))
+        if not filled_cells:
+            return OptimizationResult(self.matrix.copy(), before, before, 0, 0, 0, 0.0)
+        # Position of each filled cell in filled_cells, so a random judging is picked in O(1)
+        cell_index: Dict[tuple, int] = {cell: index for index, cell in enumerate(filled_cells)}
+        # Judges free in each slot, with their positions, so a random empty cell is picked in O(1)
+        slot_free: List[List[int]] = [[] for _ in range(num_slots)]
+        free_index: Dict[tuple, int] = {}
+        for judge, row in enumerate(rows):
+            for slot, project in enumerate(row):
+                if project == EMPTY:
+                    free_index[(judge, slot)] = len(slot_free[slot])
+                    slot_free[slot].append(judge)
+
+        average = len(filled_cells) / num_judges
+        allowed = max(self.max_deviation, max(abs(load - average) for load in loads))
+        # Emptying a slot is worth more than any single pull towards the front
+        slot_weight = 2.0 * num_slots
+        temperature_start = 2.0
+        temperature_end = 0.01
+
+        iterations = 0
+        moves = 0
+        swaps = 0
+        temperature = temperature_start
+        while True:
+            if iterations % 1024 == 0:
+                progress = (time.perf_counter() - start) / self.time_budget if self.time_budget > 0 else 1.0
+                if progress >= 1.0:
+                    break
+                temperature = temperature_start * (temperature_end / temperature_start) ** progress
+            iterations += 1
+
+            judge, slot = filled_cells[self.rng.randrange(len(filled_cells))]
+            new_slot = self.rng.randrange(num_slots)
+            if self.rng.random() < self.swap_rate:
+                # Cost-neutral step: swap two of this judge's judgings between slots, to open up room for moves
+                other = rows[judge][new_slot]
+                project = rows[judge][slot]
+                if other == EMPTY or new_slot == slot or project in slot_projects[new_slot] or other in slot_projects[slot]:
+                    continue
+                rows[judge][slot], rows[judge][new_slot] = other, project
+                slot_projects[slot].discard(project)
+                slot_projects[slot].add(other)
+                slot_projects[new_slot].discard(other)
+                slot_projects[new_slot].add(project)
+                swaps += 1
+                continue
+            if not slot_free[new_slot]:
+                continue
+            new_judge = slot_free[new_slot][self.rng.randrange(len(slot_free[new_slot]))]
+            project = rows[judge][slot]
+            if new_slot != slot and project in slot_projects[new_slot]:
+                continue
+            if new_judge != judge:
+                if project in judge_projects[new_judge] or abs(loads[new_judge] + 1 - average) > allowed \
+                        or abs(loads[judge] - 1 - average) > allowed:
+                    continue
+                if self.constraints is not None and self.constraints.conflicts(new_judge, project):
+                    continue
+
+            delta = float(new_slot - slot)
+            if new_slot != slot:
+                delta += slot_weight * ((slot_fill[new_slot] == 0) - (slot_fill[slot] == 1))
+            if new_judge != judge:
+                delta += 2 * (loads[new_judge] - loads[judge] + 1)
+            if delta > 0 and self.rng.random() >= math.exp(-delta / temperature):
+                continue
+
+            rows[judge][slot] = EMPTY
+            rows[new_judge][new_slot] = project
+            slot_projects[slot].discard(project)
+            slot_projects[new_slot].add(project)
+            judge_projects[judge].discard(project)
+            judge_projects[new_judge].add(project)
+            slot_fill[slot] -= 1
+            slot_fill[new_slot] += 1
+            loads[judge] -= 1
+            loads[new_judge] += 1
+            index = cell_index.pop((judge, slot))
+            filled_cells[index] = (new_judge, new_slot)
+            cell_index[(new_judge, new_slot)] = index
+            # The target leaves its slot's free list (swap-remove) and the source joins its own
+            free = slot_free[new_slot]
+            index = free_index.pop((new_judge, new_slot))
+            last = free.pop()
+            if last != new_judge:
+                free[index] = last
+                free_index[(last, new_slot)] = index
+            free_index[(judge, slot)] = len(slot_free[slot])
+            slot_free[slot].append(judge)
+            moves += 1
+
+        data = np.array(rows, dtype=np.int32).reshape(num_judges, num_slots)
+        optimized = AssignmentMatrix(data[:, np.flatnonzero(np.array(slot_fill) > 0)], self.matrix.num_projects)
+        after = ScheduleStats.of(optimized)
+        # Keep the input unless annealing ended somewhere strictly better
+        if (after.slots, after.idle_cells, after.load_spread, after.load_std) >= \
+                (before.slots, before.idle_cells, before.load_spread, before.load_std):
+            optimized, after = self.matrix.copy(), before
+            moves, swaps = 0, 0
+        return OptimizationResult(optimized, before, after, iterations, moves, swaps, time.perf_counter() - start)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass, field
+from typing import Iterable, List, Sequence, Tuple
+import copy
+import numpy as np
+from assignment_matrix import AssignmentMatrix, EMPTY
+from judging_assignments import AssignmentVerifier, Judge, JudgingSystem, VerificationIssue
+from roster_store import JudgeStore
+
+@dataclass
+class RepairResult:
+    matrix: AssignmentMatrix
+    # Judges whose schedules changed; every other row is identical to the input in the input's slots
+    changed_judges: List[int]
+    # (slot, project) judgings that could not be placed anywhere
+    unplaced: List[Tuple[int, int]] = field(default_factory=list)
+    issues: List[VerificationIssue] = field(default_factory=list)
+    # Trailing slots added for judgings no existing slot had room for; empty in every unchanged row
+    added_slots: int = 0
+    # The roster with any arriving judges appended, for the caller to apply; None when nobody arrived
+    judges: JudgeStore = None
+
+class ScheduleRepairer:
+    """
+    Repairs a schedule in place of a full regeneration when judges drop out
+    or arrive late. Only cells from from_slot onward are touched: removed
+    judges' remaining judgings are handed to judges who are free in that slot
+    (arriving judges first, then the least loaded), and to a new trailing
+    slot when no one is free. Judge conflicts on the system are respected.
+    """
+
+    def __init__(self, system: JudgingSystem, matrix: AssignmentMatrix):
+        self.system = system
+        self.matrix = matrix
+
+    def repair(self, from_slot: int, removed_judges: Iterable[int] = (), added_judges: Sequence[Judge] = ()) -> RepairResult:
+        removed = sorted(set(removed_judges))
+        data = self.matrix.data.copy()
+        num_existing = data.shape[0]
+
+        # Arriving judges get empty rows; they only start judging from from_slot
+        judges = None
+        system = self.system
+        if added_judges:
+            data = np.vstack([data, np.full((len(added_judges), data.shape[1]), EMPTY, dtype=np.int32)])
+            roster = self.system.judges
+            judges = JudgeStore(roster.first_names, roster.last_names, roster.judge_ids)
+            judges.extend(added_judges)
+            # Verified against a copy with the new roster; the caller's system is left as it is
+            system = copy.copy(self.system)
+            system.judges = judges
+            system.num_judges = len(judges)
+        is_added = np.arange(data.shape[0]) >= num_existing
+        available = np.ones(data.shape[0], dtype=bool)
+        available[removed] = False
+
+        # Judgings the removed judges can no longer do, in slot order
+        orphans = []
+        changed = set()
+        for judge in removed:
+            for slot in range(from_slot, data.shape[1]):
+                if data[judge, slot] != EMPTY:
+                    orphans.append((slot, int(data[judge, slot])))
+                    data[judge, slot] = EMPTY
+                    changed.add(judge)
+        orphans.sort()
+
+        loads = np.count_nonzero(data != EMPTY, axis=1)
+
+        unplaced = []
+        for original_slot, project in orphans:
+            # Judges who already see the project somewhere in the schedule, plus any conflicts
+            blocked = (data == project).any(axis=1)
+            if self.system.constraints is not None:
+                blocked |= self.system.constraints.project_conflicts(project, data.shape[0])
+            placement = self._find_placement(data, blocked, loads, available, is_added, from_slot, original_slot, project)
+            if placement is None:
+                data = np.hstack([data, np.full((data.shape[0], 1), EMPTY, dtype=np.int32)])
+                placement = self._find_placement(data, blocked, loads, available, is_added, data.shape[1] - 1,
+                                                 data.shape[1] - 1, project)
+            if placement is None:
+                unplaced.append((original_slot, project))
+                continue
+            judge, slot = placement
+            data[judge, slot] = project
+            loads[judge] += 1
+            changed.add(judge)
+
+        repaired = AssignmentMatrix(data, self.matrix.num_projects)
+        issues = [
+            issue for issue in AssignmentVerifier(None, system, repaired).find_issues()
+            if issue.kind != AssignmentVerifier.JUDGE_WORKLOAD
+        ]
+        return RepairResult(repaired, sorted(changed), unplaced, issues, data.shape[1] - self.matrix.num_slots, judges)
+
+    def fill_missing(self, targets: np.ndarray = None) -> RepairResult:
+        """
+        Places every judging a project is still short of, e.g. after a greedy
+        pass left it behind, in a free cell of a judge who does not see the
+        project yet and has no conflict with it. Judges still under their
+        entry in targets (judgings per judge) are tried first, then the least
+        loaded. A trailing slot is added when no existing slot has room.
+        """
+        data = self.matrix.data.copy()
+        num_judges = data.shape[0]
+        loads = np.count_nonzero(data != EMPTY, axis=1)
+        available = np.ones(num_judges, dtype=bool)
+        preferred = loads < targets if targets is not None else np.zeros(num_judges, dtype=bool)
+        counts = np.bincount(data[data != EMPTY], minlength=self.system.total_projects + 1)
+
+        changed = set()
+        unplaced = []
+        for project in (np.flatnonzero(counts[1:] < self.system.judgings_per_project) + 1).tolist():
+            # Judges who already see the project, plus any conflicts
+            blocked = (data == project).any(axis=1)
+            if self.system.constraints is not None:
+                blocked |= self.system.constraints.project_conflicts(project, num_judges)
+            for _ in range(self.system.judgings_per_project - int(counts[project])):
+                placement = self._find_placement(data, blocked, loads, available, preferred, 0, 0, project)
+                if placement is None:
+                    data = np.hstack([data, np.full((num_judges, 1), EMPTY, dtype=np.int32)])
+                    placement = self._find_placement(data, blocked, loads, available, preferred, data.shape[1] - 1,
+                                                     data.shape[1] - 1, project)
+                if placement is None:
+                    # Every judge already sees the project or has a conflict with it
+                    unplaced.append((EMPTY, project))
+                    break
+                judge, slot = placement
+                data[judge, slot] = project
+                blocked[judge] = True
+                loads[judge] += 1
+                # A judge who reaches their target competes on load like everyone else
+                if targets is not None and loads[judge] >= targets[judge]:
+                    preferred[judge] = False
+                changed.add(judge)
+
+        filled = AssignmentMatrix(data, self.matrix.num_projects)
+        return RepairResult(filled, sorted(changed), unplaced, AssignmentVerifier(None, self.system, filled).find_issues(),
+                            data.shape[1] - self.matrix.num_slots)
+
+    @staticmethod
+    def _find_placement(data: np.ndarray, blocked: np.ndarray, loads: np.ndarray, available: np.ndarray,
+                        is_added: np.ndarray, from_slot: int, original_slot: int, project: int):
+        # Try the judging's original slot first so its timing is kept, then the other future slots in order
+        slots = [original_slot] + [slot for slot in range(from_slot, data.shape[1]) if slot != original_slot]
+        # blocked: judges who already see the project or have a conflict with it
+        candidates_base = available & ~blocked
+        for slot in slots:
+            column = data[:, slot]
+            if (column == project).any():
+                continue
+            candidates = np.flatnonzero(candidates_base & (column == EMPTY))
+            if len(candidates):
+                # Arriving (or otherwise preferred) judges first, then the least loaded, then the lowest index
+                best = candidates[np.lexsort((candidates, loads[candidates], ~is_added[candidates]))[0]]
+                return int(best), slot
+        return None
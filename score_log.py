@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import struct
+import time
+import numpy as np
+import pandas as pd
+
+# Binary layout: header, then fixed-width little-endian records appended in arrival order
+LOG_MAGIC = b'JDSL'
+LOG_VERSION = 1
+LOG_HEADER = struct.Struct('<4sHH')
+SCORE_DTYPE = np.dtype([('judge', '<i4'), ('table', '<i4'), ('points', '<f8'), ('timestamp', '<f8')])
+POINTS_COLUMNS = ['judgeNumber', 'tableNumber', 'points']
+
+class ScoreLog:
+    """
+    Append-only binary score log. Each score is one SCORE_DTYPE record of
+    (judge, table, points, timestamp); appends only ever add bytes at the end,
+    so a reader that maps the file sees a consistent prefix. records() maps
+    the file read-only, and its fields are NumPy views with no parsing or
+    copying. A record cut short by a crash mid-append is ignored. A missing
+    log is only started (header only) with create=True.
+    """
+
+    def __init__(self, path: str, create: bool = False):
+        self.path = path
+        if not os.path.exists(path) and not create:
+            raise FileNotFoundError(f"No score log at '{path}'")
+        if create and (not os.path.exists(path) or os.path.getsize(path) == 0):
+            with open(path, 'wb') as f:
+                f.write(LOG_HEADER.pack(LOG_MAGIC, LOG_VERSION, SCORE_DTYPE.itemsize))
+            return
+        with open(path, 'rb') as f:
+            header = f.read(LOG_HEADER.size)
+        if len(header) < LOG_HEADER.size:
+            raise ValueError(f"'{path}' is not a version {LOG_VERSION} score log")
+        magic, version, record_size = LOG_HEADER.unpack(header)
+        if magic != LOG_MAGIC or version != LOG_VERSION or record_size != SCORE_DTYPE.itemsize:
+            raise ValueError(f"'{path}' is not a version {LOG_VERSION} score log")
+
+    def __len__(self) -> int:
+        return (os.path.getsize(self.path) - LOG_HEADER.size) // SCORE_DTYPE.itemsize
+
+    def append(self, judge: int, table: int, points: float, timestamp: float = None):
+        self.extend([judge], [table], [points], None if timestamp is None else [timestamp])
+
+    def extend(self, judges, tables, points, timestamps=None):
+        records = np.empty(len(judges), dtype=SCORE_DTYPE)
+        records['judge'] = judges
+        records['table'] = tables
+        records['points'] = points
+        records['timestamp'] = time.time() if timestamps is None else timestamps
+        with open(self.path, 'ab') as f:
+            f.write(records.tobytes())
+
+    def records(self) -> np.ndarray:
+        """
+        Read-only memory map of every complete record. Slicing a field, e.g.
+        records()['points'], gives a strided view into the file.
+        """
+        count = len(self)
+        if count == 0:
+            return np.empty(0, dtype=SCORE_DTYPE)
+        return np.memmap(self.path, dtype=SCORE_DTYPE, mode='r', offset=LOG_HEADER.size, shape=(count,))
+
+    def to_points(self) -> pd.DataFrame:
+        records = self.records()
+        return pd.DataFrame({
+            'judgeNumber': records['judge'],
+            'tableNumber': records['table'],
+            'points': records['points'],
+        })
+
+    @classmethod
+    def from_points(cls, points: pd.DataFrame, path: str) -> 'ScoreLog':
+        # Rows keep their CSV order; they all get the import time as their timestamp
+        log = cls(path, create=True)
+        log.extend(points['judgeNumber'].to_numpy(), points['tableNumber'].to_numpy(), points['points'].to_numpy())
+        return log
+
+def sample_std(n, m2):
+    """
+    Sample standard deviation from a point count and sum of squared
+    deviations (n, M2), matching pandas' std(). NaN for fewer than two points
+    or no spread. Takes scalars or arrays.
+    """
+    n, m2 = np.asarray(n, dtype=np.float64), np.asarray(m2, dtype=np.float64)
+    defined = (n > 1) & (m2 > 0)
+    return np.where(defined, np.sqrt(np.where(defined, m2, 0.0) / np.where(defined, n - 1, 1.0)), np.nan)
+
+def standardized_sum(point_sum, point_count, mean, std):
+    # Sum of point_count z-scores against a judge's mean and std, from the points' sum; scalars or arrays
+    return (point_sum - point_count * mean) / std
+
+def standardized_points(records: np.ndarray, judge_codes: np.ndarray = None, num_judges: int = None) -> np.ndarray:
+    """
+    Each record's points as a z-score within its judge's points, with the
+    sample standard deviation, as aggregate_points computes them. Judges with
+    one score or no spread, and records without points, standardize to NaN.
+    judge_codes (dense judge index per record) can be passed if already known.
+    """
+    if judge_codes is None:
+        judges, judge_codes = np.unique(records['judge'], return_inverse=True)
+        num_judges = len(judges)
+    points = np.asarray(records['points'], dtype=np.float64)
+    scored = ~np.isnan(points)
+    values = np.where(scored, points, 0.0)
+    n = np.bincount(judge_codes, weights=scored, minlength=num_judges)
+    mean = np.bincount(judge_codes, weights=values, minlength=num_judges) / np.where(n > 0, n, 1)
+    deviation = np.where(scored, values - mean[judge_codes], 0.0)
+    std = sample_std(n, np.bincount(judge_codes, weights=deviation ** 2, minlength=num_judges))
+    return np.where(scored, standardized_sum(values, 1, mean[judge_codes], std[judge_codes]), np.nan)
+
+def group_log(records: np.ndarray) -> pd.DataFrame:
+    """
+    Per-table mean standardized points and distinct judge counts, the table
+    aggregate_points builds before sorting, computed on the record arrays
+    with bincount instead of a DataFrame groupby.
+    """
+    if len(records) == 0:
+        return pd.DataFrame({'tableNumber': np.empty(0, dtype=np.int32), 'standardizedPoints': np.empty(0),
+                             'judgeCount': np.empty(0, dtype=np.int64)})
+    judges, judge_codes = np.unique(records['judge'], return_inverse=True)
+    standardized = standardized_points(records, judge_codes, len(judges))
+    tables, table_codes = np.unique(records['table'], return_inverse=True)
+    valid = ~np.isnan(standardized)
+    sums = np.bincount(table_codes, weights=np.where(valid, standardized, 0.0), minlength=len(tables))
+    counts = np.bincount(table_codes, weights=valid, minlength=len(tables))
+    # Distinct judges per table, from the unique (table, judge) pairs encoded as one integer each
+    pairs = np.sort(table_codes.astype(np.int64) * len(judges) + judge_codes)
+    pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    return pd.DataFrame({
+        'tableNumber': tables,
+        'standardizedPoints': sums / np.where(counts > 0, counts, np.nan),
+        'judgeCount': np.bincount(pairs // len(judges), minlength=len(tables)),
+    })
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert between points.csv and the binary score log.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    to_log = subparsers.add_parser('import', help="append the rows of a points CSV to a score log")
+    to_log.add_argument('points')
+    to_log.add_argument('log')
+    to_csv = subparsers.add_parser('export', help="write a score log back out as a points CSV")
+    to_csv.add_argument('log')
+    to_csv.add_argument('points')
+    args = parser.parse_args(argv)
+
+    if args.command == 'import':
+        log = ScoreLog.from_points(pd.read_csv(args.points, usecols=POINTS_COLUMNS), args.log)
+        print(f"'{args.log}' now holds {len(log)} scores")
+    else:
+        points = ScoreLog(args.log).to_points()
+        points.to_csv(args.points, index=False)
+        print(f"Wrote {len(points)} scores to '{args.points}'")
+
+if __name__ == "__main__":
+    main()
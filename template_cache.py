@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass
+from typing import List, Optional
+import os
+import re
+import tempfile
+from assignment_export import read_binary, write_binary
+from assignment_matrix import AssignmentMatrix
+
+# Bump when templates generated by older code should no longer be reused
+TEMPLATE_VERSION = 1
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+@dataclass(frozen=True)
+class TemplateKey:
+    num_judges: int
+    total_projects: int
+    num_rooms: int
+    judgings_per_project: int
+    seed: int
+    # Generation settings that change the schedule, e.g. 'exact' or 'greedy-p8-best'
+    variant: str = 'greedy'
+
+    def filename(self) -> str:
+        variant = re.sub(r'[^A-Za-z0-9_.-]', '_', self.variant)
+        return (f'v{TEMPLATE_VERSION}-j{self.num_judges}-p{self.total_projects}-r{self.num_rooms}'
+                f'-k{self.judgings_per_project}-s{self.seed}-{variant}.jdga')
+
+class TemplateCache:
+    """
+    On-disk cache of verified integer schedules keyed by event shape. A
+    template holds project ids only; names are attached by the exporter, so
+    any roster of the same shape can reuse it. Files are in the binary
+    assignment format. Recency is the file's modification time, refreshed
+    on every hit, and the least recently used templates are evicted once
+    the directory grows past max_bytes or max_entries.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES, max_entries: int = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: TemplateKey) -> str:
+        return os.path.join(self.directory, key.filename())
+
+    def get(self, key: TemplateKey) -> Optional[AssignmentMatrix]:
+        path = self._path(key)
+        try:
+            matrix = read_binary(path)
+        except (FileNotFoundError, ValueError):
+            return None
+        if matrix.num_judges != key.num_judges or matrix.num_projects != key.total_projects:
+            return None
+        # Mark as most recently used
+        os.utime(path)
+        return AssignmentMatrix(matrix.data.copy(), matrix.num_projects)
+
+    def put(self, key: TemplateKey, matrix: AssignmentMatrix):
+        # Written to a temporary file and renamed, so concurrent readers never see a partial template
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        os.close(fd)
+        try:
+            write_binary(temp_path, matrix)
+            os.replace(temp_path, self._path(key))
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.evict()
+
+    def _entries(self) -> List[os.DirEntry]:
+        return [entry for entry in os.scandir(self.directory) if entry.is_file() and entry.name.endswith('.jdga')]
+
+    def evict(self) -> int:
+        # Removes least recently used templates until within both bounds; returns how many were removed
+        entries = sorted(self._entries(), key=lambda entry: entry.stat().st_mtime)
+        total = sum(entry.stat().st_size for entry in entries)
+        removed = 0
+        while entries and (total > self.max_bytes or (self.max_entries is not None and len(entries) > self.max_entries)):
+            oldest = entries.pop(0)
+            total -= oldest.stat().st_size
+            try:
+                os.remove(oldest.path)
+            except FileNotFoundError:
+                pass
+            removed += 1
+        return removed
+
+    def __len__(self) -> int:
+        return len(self._entries())
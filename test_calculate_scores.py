@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+import pandas as pd
+from calculate_scores import aggregate_points, aggregate_points_streaming
+
+TEAMS = pd.DataFrame({'tableNumber': [1, 2, 3], 'teamName': ['a', 'b', 'c']})
+
+def test_streaming_matches_batch_on_empty_points(tmp_path):
+    points_path = tmp_path / 'points.csv'
+    points_path.write_text('judgeNumber,tableNumber,points\n')
+    batch = aggregate_points(pd.read_csv(points_path), TEAMS)
+    streamed = aggregate_points_streaming(str(points_path), TEAMS)
+    assert streamed.empty
+    pd.testing.assert_frame_equal(streamed, batch, check_dtype=False)
+
+def test_streaming_matches_batch_across_chunks(tmp_path):
+    points_path = tmp_path / 'points.csv'
+    pd.DataFrame({
+        'judgeNumber': [1, 1, 1, 2, 2, 2, 3],
+        'tableNumber': [1, 2, 3, 1, 2, 3, 2],
+        'points': [5, 7, 9, 2, 2, 6, 4],
+    }).to_csv(points_path, index=False)
+    batch = aggregate_points(pd.read_csv(points_path), TEAMS)
+    streamed = aggregate_points_streaming(str(points_path), TEAMS, chunksize=2)
+    pd.testing.assert_frame_equal(streamed, batch, check_dtype=False)
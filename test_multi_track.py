@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+import random
+from multi_track import plan_loads
+
+def _all_loads(dedicated_loads, shared_splits):
+    return [load for loads in dedicated_loads for load in loads] + [sum(split.values()) for split in shared_splits]
+
+def _check_totals(demands, dedicated_loads, shared_splits):
+    for track, demand in enumerate(demands):
+        assert sum(dedicated_loads[track]) + sum(split.get(track, 0) for split in shared_splits) == demand
+
+def test_leftover_judgings_are_not_piled_on_the_shared_pool():
+    dedicated_loads, shared_splits = plan_loads([419], [20], 1)
+    _check_totals([419], dedicated_loads, shared_splits)
+    loads = _all_loads(dedicated_loads, shared_splits)
+    assert max(loads) - min(loads) <= 1
+
+def test_only_track_limited_judges_fall_below_the_share():
+    # The first track's 6 judges only have 90 judgings between them; everyone else stays within one of each other
+    dedicated_loads, shared_splits = plan_loads([90, 150, 60], [6, 8, 0], 5)
+    _check_totals([90, 150, 60], dedicated_loads, shared_splits)
+    assert dedicated_loads[0] == [15] * 6
+    loads = _all_loads(dedicated_loads[1:], shared_splits)
+    assert max(loads) - min(loads) <= 1
+
+def test_loads_differ_by_at_most_one_when_the_pool_is_large_enough():
+    rng = random.Random(0)
+    checked = 0
+    for _ in range(500):
+        num_tracks = rng.randint(1, 4)
+        demands = [rng.randint(0, 400) for _ in range(num_tracks)]
+        dedicated = [rng.randint(0, 10) for _ in range(num_tracks)]
+        num_shared = rng.randint(1, 10)
+        dedicated_loads, shared_splits = plan_loads(demands, dedicated, num_shared)
+        _check_totals(demands, dedicated_loads, shared_splits)
+        per_judge = sum(demands) // (sum(dedicated) + num_shared)
+        # Large enough: no track's demand limits its dedicated judges below per_judge + 1
+        if all(demand >= count * (per_judge + 1) for demand, count in zip(demands, dedicated)):
+            loads = _all_loads(dedicated_loads, shared_splits)
+            assert max(loads) - min(loads) <= 1
+            checked += 1
+    assert checked > 100
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
+import numpy as np
+from assignment_matrix import AssignmentMatrix, EMPTY
+from roster_store import RoomStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_SLOT_MINUTES = 10.0
+
+@dataclass
+class TimingReport:
+    slot_minutes: float
+    judgings: int
+    # Walking time added before each slot, waiting for the slowest judge to arrive
+    transition_minutes: np.ndarray
+    judge_travel_minutes: np.ndarray
+
+    @property
+    def num_slots(self) -> int:
+        return len(self.transition_minutes)
+
+    @property
+    def total_travel_minutes(self) -> float:
+        return float(self.judge_travel_minutes.sum())
+
+    @property
+    def makespan_minutes(self) -> float:
+        return self.num_slots * self.slot_minutes + float(self.transition_minutes.sum())
+
+    @property
+    def judgings_per_hour(self) -> float:
+        return self.judgings * 60 / self.makespan_minutes if self.makespan_minutes else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'slots': self.num_slots,
+            'slot_minutes': self.slot_minutes,
+            'transition_minutes': round(float(self.transition_minutes.sum()), 2),
+            'makespan_minutes': round(self.makespan_minutes, 2),
+            'total_travel_minutes': round(self.total_travel_minutes, 2),
+            'judgings_per_hour': round(self.judgings_per_hour, 2),
+        }
+
+    def summary(self) -> str:
+        return (f"Projected duration: {self.makespan_minutes:.1f} min "
+                f"({self.num_slots} slots x {self.slot_minutes:g} min + {self.transition_minutes.sum():.1f} min walking), "
+                f"{self.total_travel_minutes:.1f} judge-minutes of travel, {self.judgings_per_hour:.1f} judgings per hour")
+
+class TravelModel:
+    """
+    Walking minutes between projects, from a room-to-room or table-to-table
+    distance matrix, plus the fixed length of one judging slot.
+
+    Slots run in lockstep, so each slot starts once the slowest judge has
+    walked from their previous judging; a judge who sits out slots walks
+    during them.
+    """
+
+    def __init__(self, distances: np.ndarray, project_locations: np.ndarray, room_distances: np.ndarray,
+                 slot_minutes: float = DEFAULT_SLOT_MINUTES):
+        self.distances = np.asarray(distances, dtype=float)
+        # Location (row of distances) of project id p at index p - 1
+        self.project_locations = np.asarray(project_locations, dtype=np.intp)
+        self.room_distances = np.asarray(room_distances, dtype=float)
+        self.slot_minutes = slot_minutes
+        num_rooms = len(self.room_distances)
+        self._rooms_by_distance = [
+            sorted(range(num_rooms), key=lambda other: (self.room_distances[room, other], other))
+            for room in range(num_rooms)
+        ]
+
+    @classmethod
+    def from_dataframe(cls, df: 'pd.DataFrame', rooms: RoomStore, table_numbers: np.ndarray,
+                       slot_minutes: float = DEFAULT_SLOT_MINUTES) -> 'TravelModel':
+        """
+        df is a square matrix whose row and column labels are either room ids
+        (1..num_rooms) or table numbers. Table-level distances between rooms
+        are averaged to plan the room rotation.
+        """
+        import pandas as pd
+        labels = pd.to_numeric(pd.Index(df.columns).astype(str).str.strip(), errors='coerce')
+        rows = pd.to_numeric(pd.Index(df.index).astype(str).str.strip(), errors='coerce')
+        if df.shape[0] != df.shape[1] or np.isnan(labels).any() or not np.array_equal(labels, rows):
+            raise ValueError("Distance matrix must be square with matching numeric row and column labels")
+        distances = df.to_numpy(dtype=float)
+        if np.isnan(distances).any() or (distances < 0).any():
+            raise ValueError("Distance matrix must contain non-negative numbers only")
+        labels = labels.to_numpy(dtype=np.int64)
+
+        num_rooms = len(rooms)
+        room_of = rooms.room_of(np.arange(1, len(table_numbers) + 1))
+        if np.array_equal(np.sort(labels), np.arange(1, num_rooms + 1)):
+            order = np.argsort(labels)
+            room_distances = distances[np.ix_(order, order)]
+            return cls(room_distances, room_of, room_distances, slot_minutes)
+
+        position = {label: i for i, label in enumerate(labels.tolist())}
+        missing = [table for table in table_numbers.tolist() if table not in position]
+        if missing:
+            raise ValueError(f"Distance matrix has neither one row per room ({num_rooms}) nor rows for "
+                             f"tables {', '.join(map(str, missing[:10]))}")
+        project_locations = np.array([position[table] for table in table_numbers.tolist()], dtype=np.intp)
+        room_distances = np.zeros((num_rooms, num_rooms))
+        for a in range(num_rooms):
+            for b in range(num_rooms):
+                block = distances[np.ix_(project_locations[room_of == a], project_locations[room_of == b])]
+                room_distances[a, b] = block.mean() if block.size else 0.0
+        return cls(distances, project_locations, room_distances, slot_minutes)
+
+    @classmethod
+    def from_csv(cls, path: str, rooms: RoomStore, table_numbers: np.ndarray,
+                 slot_minutes: float = DEFAULT_SLOT_MINUTES) -> 'TravelModel':
+        import pandas as pd
+        return cls.from_dataframe(pd.read_csv(path, index_col=0), rooms, table_numbers, slot_minutes)
+
+    def rooms_by_distance(self, room: int) -> List[int]:
+        return self._rooms_by_distance[room]
+
+    def _tour_cost(self, tour: Sequence[int]) -> Tuple[float, float]:
+        # Judges start at every point of the cycle, so every edge is walked; the longest sets the phase change time
+        edges = self.room_distances[tour, np.roll(tour, -1)]
+        return (float(edges.max()), float(edges.sum())) if len(tour) > 1 else (0.0, 0.0)
+
+    def room_tour(self) -> List[int]:
+        """
+        Cyclic room order for the phase rotation: nearest-neighbour from room 0,
+        then 2-opt reversals while they shorten the longest hop or, at equal
+        longest hop, the total walk.
+        """
+        num_rooms = len(self.room_distances)
+        if num_rooms < 3:
+            return list(range(num_rooms))
+        tour = [0]
+        unvisited = set(range(1, num_rooms))
+        while unvisited:
+            nearest = min(unvisited, key=lambda room: (self.room_distances[tour[-1], room], room))
+            tour.append(nearest)
+            unvisited.remove(nearest)
+
+        best = self._tour_cost(tour)
+        improved = True
+        while improved:
+            improved = False
+            for i in range(1, num_rooms - 1):
+                for j in range(i + 1, num_rooms):
+                    candidate = tour[:i] + tour[i:j + 1][::-1] + tour[j + 1:]
+                    cost = self._tour_cost(candidate)
+                    if cost < best:
+                        tour, best, improved = candidate, cost, True
+        return tour
+
+    def _cell_locations(self, data: np.ndarray) -> np.ndarray:
+        locations = np.full(data.shape, EMPTY, dtype=np.intp)
+        filled = data != EMPTY
+        locations[filled] = self.project_locations[data[filled] - 1]
+        return locations
+
+    def timing(self, matrix: AssignmentMatrix) -> TimingReport:
+        locations = self._cell_locations(matrix.data)
+        num_judges, num_slots = locations.shape
+        previous = np.full(num_judges, EMPTY, dtype=np.intp)
+        idle_slots = np.zeros(num_judges)
+        transitions = np.zeros(num_slots)
+        travel = np.zeros(num_judges)
+        for slot in range(num_slots):
+            current = locations[:, slot]
+            moving = np.flatnonzero((current != EMPTY) & (previous != EMPTY))
+            minutes = self.distances[previous[moving], current[moving]]
+            travel[moving] += minutes
+            if len(moving):
+                transitions[slot] = max(0.0, float((minutes - idle_slots[moving] * self.slot_minutes).max()))
+            filled = current != EMPTY
+            previous[filled] = current[filled]
+            idle_slots[filled] = 0
+            idle_slots[~filled & (previous != EMPTY)] += 1
+        return TimingReport(self.slot_minutes, int(np.count_nonzero(matrix.filled_mask())), transitions, travel)
+
+    def _cell_cost(self, locations: np.ndarray, judge: int, slot: int, location: int) -> float:
+        # Walking into and out of (judge, slot) if it were at location, from the neighbouring filled cells
+        row = locations[judge]
+        cost = 0.0
+        before = row[:slot][row[:slot] != EMPTY]
+        after = row[slot + 1:][row[slot + 1:] != EMPTY]
+        if len(before):
+            cost += self.distances[before[-1], location]
+        if len(after):
+            cost += self.distances[location, after[0]]
+        return cost
+
+    def reduce_travel(self, matrix: AssignmentMatrix, max_passes: int = 3, constraints=None) -> int:
+        """
+        Swaps the projects of two judges within the same slot, in place, when
+        that cuts their combined walking. Same-slot swaps keep every project's
+        count, every judge's load and each slot's project set unchanged.
+        Swaps that would break a JudgeConstraints conflict are skipped.
+        Returns the number of swaps made.
+        """
+        data = matrix.data
+        locations = self._cell_locations(data)
+        swaps = 0
+        for _ in range(max_passes):
+            swapped = 0
+            for slot in range(data.shape[1]):
+                # Judges in this slot by the location they are judging at
+                at_location: Dict[int, List[int]] = {}
+                for judge in np.flatnonzero(locations[:, slot] != EMPTY).tolist():
+                    at_location.setdefault(int(locations[judge, slot]), []).append(judge)
+                for judge in range(data.shape[0]):
+                    here = locations[judge, slot]
+                    if here == EMPTY:
+                        continue
+                    cost = self._cell_cost(locations, judge, slot, here)
+                    if cost == 0:
+                        continue
+                    row = locations[judge]
+                    neighbours = [row[s] for s in (slot - 1, slot + 1) if 0 <= s < len(row) and row[s] != EMPTY]
+                    for target in neighbours:
+                        for other in at_location.get(int(target), ()):
+                            there = locations[other, slot]
+                            if other == judge or there == here:
+                                continue
+                            delta = (self._cell_cost(locations, judge, slot, there) + self._cell_cost(locations, other, slot, here)
+                                     - cost - self._cell_cost(locations, other, slot, there))
+                            # A judge must not end up seeing the same project twice
+                            if delta >= 0 or (data[judge] == data[other, slot]).any() or (data[other] == data[judge, slot]).any():
+                                continue
+                            if constraints is not None and (constraints.conflicts(judge, int(data[other, slot]))
+                                                            or constraints.conflicts(other, int(data[judge, slot]))):
+                                continue
+                            data[judge, slot], data[other, slot] = data[other, slot], data[judge, slot]
+                            locations[judge, slot], locations[other, slot] = there, here
+                            at_location[int(here)].remove(judge)
+                            at_location[int(here)].append(other)
+                            at_location[int(there)].remove(other)
+                            at_location[int(there)].append(judge)
+                            swapped += 1
+                            break
+                        else:
+                            continue
+                        break
+            swaps += swapped
+            if not swapped:
+                break
+        return swaps
+
+    def _transition_costs(self, locations: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # longest[a, b] / total[a, b]: slowest and summed walk if slot b directly follows slot a
+        num_slots = locations.shape[1]
+        longest = np.zeros((num_slots, num_slots))
+        total = np.zeros((num_slots, num_slots))
+        for a in range(num_slots):
+            source = locations[:, a][:, None]
+            moving = (source != EMPTY) & (locations != EMPTY)
+            minutes = np.where(moving, self.distances[np.where(moving, source, 0), np.where(moving, locations, 0)], 0.0)
+            longest[a] = minutes.max(axis=0) if len(minutes) else 0.0
+            total[a] = minutes.sum(axis=0)
+        return longest, total
+
+    def order_slots(self, matrix: AssignmentMatrix, max_passes: int = 3) -> AssignmentMatrix:
+        """
+        Reorders whole slots to shorten the walking between consecutive slots,
+        which leaves every per-slot guarantee intact. Pairs of slots are swapped
+        while that lowers the summed longest walk (the makespan) or, at equal
+        makespan, the total walk.
+        """
+        num_slots = matrix.num_slots
+        if num_slots < 3:
+            return matrix
+        longest, total = self._transition_costs(self._cell_locations(matrix.data))
+
+        def cost(order: List[int]) -> Tuple[float, float]:
+            return (float(longest[order[:-1], order[1:]].sum()), float(total[order[:-1], order[1:]].sum()))
+
+        order = list(range(num_slots))
+        best = cost(order)
+        for _ in range(max_passes):
+            improved = False
+            for i in range(num_slots - 1):
+                for j in range(i + 1, num_slots):
+                    order[i], order[j] = order[j], order[i]
+                    candidate = cost(order)
+                    if candidate < best:
+                        best, improved = candidate, True
+                    else:
+                        order[i], order[j] = order[j], order[i]
+            if not improved:
+                break
+        reordered = AssignmentMatrix(matrix.data[:, order], matrix.num_projects)
+        # The pairwise costs ignore walking done during idle slots, so confirm against the full timing model
+        if self.timing(reordered).makespan_minutes < self.timing(matrix).makespan_minutes:
+            return reordered
+        return matrix